@@ -25,10 +25,24 @@ from protocol.reliability import ReliabilityLayer
 from protocol.state_machine import ProtocolStateMachine
 from protocol.broadcast import BroadcastDiscovery
 from protocol import game_logic
+from protocol import console
+from protocol.console import log
 
 # Allow overriding the broadcast port via environment variable
 BROADCAST_PORT = int(os.getenv("POKEMON_BROADCAST_PORT", "5556"))
 
+# Network loop receive wait bounds (seconds). The upper bound is how quickly
+# an idle loop notices shutdown or a frame queued from the input thread.
+MAX_RECEIVE_WAIT = 0.1
+MIN_RECEIVE_WAIT = 0.001
+
+
+def prompt(text: str) -> str:
+    """input(), after writing out queued console output so the prompt comes last."""
+    console.flush()
+    return input(text)
+
+
 class BattleApplication:
     """Main application controller."""
 
@@ -55,7 +69,7 @@ class BattleApplication:
             host_port: Remote host port (for JOINER/SPECTATOR)
         """
         # Load game data
-        print("[App] Loading Pokémon and moves from CSV...")
+        log("[App] Loading Pokémon and moves from CSV...")
         game_logic.initialize_databases(pokemon_csv="pokemon.csv", verbose=True)
 
         # Initialize transport
@@ -63,7 +77,7 @@ class BattleApplication:
         self.transport.open()
 
         # Initialize reliability layer
-        self.reliability = ReliabilityLayer(timeout=0.5, max_retries=3)
+        self.reliability = ReliabilityLayer(timeout=0.5, max_retries=3, ack_delay=0.005)
 
         # Initialize state machine
         self.state_machine = ProtocolStateMachine(
@@ -81,37 +95,52 @@ class BattleApplication:
             # For JOINER, this is only used for sending invitations if needed
             self.broadcast.open(listen_only=False)
         except Exception as e:
-            print(f"[App] Warning: broadcast discovery failed to open: {e}")
+            log(f"[App] Warning: broadcast discovery failed to open: {e}")
             self.broadcast = None
 
         # If joining, send handshake request
         if role == "JOINER" and host_ip and host_port:
-            print(f"[App] Sending HANDSHAKE_REQUEST to {host_ip}:{host_port}")
-            self.state_machine.peer_addr = (host_ip, host_port)
+            log(f"[App] Sending HANDSHAKE_REQUEST to {host_ip}:{host_port}")
+            # A JOINER only ever talks to the HOST
+            peer = self._connect_peer(host_ip, host_port)
+            self.state_machine.peer_addr = peer
             ok, _ = self.reliability.send_reliable(
                 self.transport,
                 {"message_type": "HANDSHAKE_REQUEST"},
-                (host_ip, host_port)
+                peer
             )
             if not ok:
-                print("[App] Warning: initial HANDSHAKE_REQUEST may not have been sent")
+                log("[App] Warning: initial HANDSHAKE_REQUEST may not have been sent")
             else:
-                print("[App] HANDSHAKE_REQUEST sent successfully")
+                log("[App] HANDSHAKE_REQUEST sent successfully")
 
         # If spectating, send spectator request
         elif role == "SPECTATOR" and host_ip and host_port:
-            print(f"[App] Sending SPECTATOR_REQUEST to {host_ip}:{host_port}")
-            self.state_machine.peer_addr = (host_ip, host_port)
+            log(f"[App] Sending SPECTATOR_REQUEST to {host_ip}:{host_port}")
+            peer = self._connect_peer(host_ip, host_port)
+            self.state_machine.peer_addr = peer
             ok, _ = self.reliability.send_reliable(
                 self.transport,
                 {"message_type": "SPECTATOR_REQUEST"},
-                (host_ip, host_port)
+                peer
             )
             if not ok:
-                print("[App] Warning: initial SPECTATOR_REQUEST may not have been sent")
+                log("[App] Warning: initial SPECTATOR_REQUEST may not have been sent")
 
         self.running = True
 
+    def _connect_peer(self, host_ip: str, host_port: int):
+        """
+        Connect the transport to the HOST and return its resolved address.
+        If that fails (e.g. the name does not resolve), keep the socket
+        unconnected and address the HOST as given.
+        """
+        try:
+            return self.transport.connect((host_ip, host_port))
+        except OSError as e:
+            log(f"[UDP] Connect error: {e}")
+            return (host_ip, host_port)
+
     def announce_game_loop(self):
         """Periodically announce game availability (for HOST)."""
         # Defensive: ensure broadcast and transport exist
@@ -120,66 +149,71 @@ class BattleApplication:
                 if self.broadcast and self.transport:
                     self.broadcast.announce_game(self.player_name, self.transport.port)
             except Exception as e:
-                print(f"[App] Error while announcing game: {e}")
+                log(f"[App] Error while announcing game: {e}")
             time.sleep(2)
 
     def network_loop(self):
         """Main network receive loop."""
         if not self.transport or not self.state_machine:
-            print("[App] Network loop cannot start: transport or state machine missing")
+            log("[App] Network loop cannot start: transport or state machine missing")
             self.running = False
             return
 
         try:
             while self.running and self.state_machine.running:
                 try:
-                    # Receive incoming messages (non-blocking or with small timeout in implementation)
-                    incoming = self.transport.receive()
+                    # Receive incoming messages: wait for the first until data
+                    # arrives or the reliability timers next need a tick(),
+                    # then drain whatever else is already queued
+                    wait = MAX_RECEIVE_WAIT
+                    due = self.state_machine.next_deadline()
+                    if due is not None:
+                        wait = min(wait, max(due - time.time(), MIN_RECEIVE_WAIT))
+                    incoming = self.transport.receive_batch(timeout=wait)
                     if incoming:
-                        # incoming is expected to be (bytes, (ip, port))
-                        self.state_machine.handle_incoming(incoming)
+                        # incoming is a list of (bytes, (ip, port))
+                        self.state_machine.handle_incoming_batch(incoming)
 
-                    # Tick reliability layer and state machine
+                    # Tick reliability layer and state machine. No sleep: the
+                    # receive above already blocks for up to `wait` while idle,
+                    # and returns as soon as a datagram arrives.
                     self.state_machine.tick()
-
-                    # Small delay to prevent CPU spinning
-                    time.sleep(0.001)
                 except Exception as e:
                     # Log but keep loop alive if possible
-                    print(f"[App] Exception in network loop: {e}")
+                    log(f"[App] Exception in network loop: {e}")
                     time.sleep(0.1)
         finally:
-            print("[App] Network loop ended")
+            log("[App] Network loop ended")
             self.running = False
 
     def input_loop(self):
         """Handle user input commands."""
-        print("\n" + "="*60)
-        print("POKEPROTOCOL BATTLE - COMMANDS:")
-        print("="*60)
+        log("\n" + "="*60)
+        log("POKEPROTOCOL BATTLE - COMMANDS:")
+        log("="*60)
         if self.state_machine and self.state_machine.role == "SPECTATOR":
-            print("  chat <message>                     - Send chat message")
-            print("  list                               - List your Pokémon abilities")
-            print("  status                             - Show battle status")
-            print("  quit                               - Exit application")
+            log("  chat <message>                     - Send chat message")
+            log("  list                               - List your Pokémon abilities")
+            log("  status                             - Show battle status")
+            log("  quit                               - Exit application")
         else:
-            print("  setup <pokemon> <sp_atk> <sp_def>  - Setup your Pokémon")
-            print("  attack <move>                      - Use a move (your turn)")
-            print("  chat <message>                     - Send chat message")
-            print("  sticker <filepath>                 - Send sticker image")
-            print("  list                               - List your Pokémon abilities")
-            print("  status                             - Show battle status")
-            print("  quit                               - Exit application")
-        print("="*60 + "\n")
+            log("  setup <pokemon> <sp_atk> <sp_def>  - Setup your Pokémon")
+            log("  attack <move>                      - Use a move (your turn)")
+            log("  chat <message>                     - Send chat message")
+            log("  sticker <filepath>                 - Send sticker image")
+            log("  list                               - List your Pokémon abilities")
+            log("  status                             - Show battle status")
+            log("  quit                               - Exit application")
+        log("="*60 + "\n")
 
         # Defensive: ensure state_machine exists
         if not self.state_machine:
-            print("[App] Error: state machine not initialized. Call setup() first.")
+            log("[App] Error: state machine not initialized. Call setup() first.")
             return
 
         while self.running and self.state_machine.running:
             try:
-                cmd = input("> ").strip()
+                cmd = prompt("> ").strip()
                 if not cmd:
                     continue
 
@@ -187,19 +221,19 @@ class BattleApplication:
                 action = parts[0].lower()
 
                 if action == "quit":
-                    print("[App] Quitting...")
+                    log("[App] Quitting...")
                     self.running = False
                     break
 
                 elif action == "setup" and len(parts) > 1:
                     if self.state_machine and self.state_machine.role == "SPECTATOR":
-                        print("[App] Spectators cannot setup Pokémon. Only chat is allowed.")
+                        log("[App] Spectators cannot setup Pokémon. Only chat is allowed.")
                         continue
                     self._handle_setup(parts[1])
 
                 elif action == "attack" and len(parts) > 1:
                     if self.state_machine and self.state_machine.role == "SPECTATOR":
-                        print("[App] Spectators cannot attack. Only chat is allowed.")
+                        log("[App] Spectators cannot attack. Only chat is allowed.")
                         continue
                     self._handle_attack(parts[1])
 
@@ -208,7 +242,7 @@ class BattleApplication:
 
                 elif action == "sticker" and len(parts) > 1:
                     if self.state_machine and self.state_machine.role == "SPECTATOR":
-                        print("[App] Spectators cannot send stickers. Only chat is allowed.")
+                        log("[App] Spectators cannot send stickers. Only chat is allowed.")
                         continue
                     self._handle_sticker(parts[1])
 
@@ -219,12 +253,12 @@ class BattleApplication:
                     self._handle_status()
 
                 else:
-                    print("Unknown command. Type 'list' for Pokémon/moves or 'quit' to exit.")
+                    log("Unknown command. Type 'list' for Pokémon/moves or 'quit' to exit.")
 
             except EOFError:
                 break
             except KeyboardInterrupt:
-                print("\n[App] Interrupted")
+                log("\n[App] Interrupted")
                 self.running = False
                 break
 
@@ -232,7 +266,7 @@ class BattleApplication:
         """Handle setup command."""
         parts = args.split()
         if len(parts) < 3:
-            print("Usage: setup <pokemon_name> <special_attack_uses> <special_defense_uses>")
+            log("Usage: setup <pokemon_name> <special_attack_uses> <special_defense_uses>")
             return
 
         pokemon_name = parts[0]
@@ -240,13 +274,13 @@ class BattleApplication:
             sp_atk_uses = int(parts[1])
             sp_def_uses = int(parts[2])
         except ValueError:
-            print("Error: special_attack_uses and special_defense_uses must be integers")
+            log("Error: special_attack_uses and special_defense_uses must be integers")
             return
 
         # Create Pokémon
         pokemon = game_logic.create_pokemon(pokemon_name, sp_atk_uses, sp_def_uses)
         if not pokemon:
-            print(f"Error: Unknown Pokémon '{pokemon_name}'. Type 'list' to see available Pokémon.")
+            log(f"Error: Unknown Pokémon '{pokemon_name}'. Type 'list' to see available Pokémon.")
             return
 
         # Send battle setup
@@ -257,13 +291,13 @@ class BattleApplication:
 
         # Ensure state_machine exists
         if not self.state_machine:
-            print("[App] Error: State machine not initialized.")
+            log("[App] Error: State machine not initialized.")
             return
 
         self.state_machine.send_battle_setup(pokemon, stat_boosts)
-        print("\nmessage_type: BATTLE_SETUP_SENT")
-        print(f"pokemon_name: {pokemon.name}")
-        print(f"hp: {pokemon.hp}")
+        log("\nmessage_type: BATTLE_SETUP_SENT")
+        log(f"pokemon_name: {pokemon.name}")
+        log(f"hp: {pokemon.hp}")
 
     def _handle_attack(self, move_name: str):
         """Handle attack command."""
@@ -272,23 +306,23 @@ class BattleApplication:
         # Check if move exists
         move = game_logic.get_move(move_name)
         if not move:
-            print(f"Error: Unknown move '{move_name}'. Type 'list' to see available moves.")
+            log(f"Error: Unknown move '{move_name}'. Type 'list' to see available moves.")
             return
 
         if not self.state_machine:
-            print("[App] Error: State machine not initialized.")
+            log("[App] Error: State machine not initialized.")
             return
 
         success = self.state_machine.send_attack(move_name)
         if success:
-            print(f"[App] Attacking with {move_name}...")
+            log(f"[App] Attacking with {move_name}...")
         else:
-            print(f"[App] Failed to send attack. Check if it's your turn and both Pokémon are set up.")
+            log(f"[App] Failed to send attack. Check if it's your turn and both Pokémon are set up.")
 
     def _handle_chat(self, message: str):
         """Handle chat command."""
         if not self.state_machine:
-            print("[App] Error: State machine not initialized.")
+            log("[App] Error: State machine not initialized.")
             return
 
         self.state_machine.send_chat_text(self.player_name, message)
@@ -299,19 +333,19 @@ class BattleApplication:
             with open(filepath, 'rb') as f:
                 sticker_bytes = f.read()
             if not self.state_machine:
-                print("[App] Error: State machine not initialized.")
+                log("[App] Error: State machine not initialized.")
                 return
             self.state_machine.send_chat_sticker(self.player_name, sticker_bytes)
         except FileNotFoundError:
-            print(f"Error: File '{filepath}' not found")
+            log(f"Error: File '{filepath}' not found")
         except Exception as e:
-            print(f"Error loading sticker: {e}")
+            log(f"Error loading sticker: {e}")
 
     def _handle_list(self):
         """List the user's Pokémon's abilities (moves)."""
-        print("\n" + "="*60)
-        print("YOUR POKÉMON'S ABILITIES (MOVES):")
-        print("="*60)
+        log("\n" + "="*60)
+        log("YOUR POKÉMON'S ABILITIES (MOVES):")
+        log("="*60)
         if self.state_machine and self.state_machine.local_pokemon:
             p = self.state_machine.local_pokemon
             abilities = p.abilities or []
@@ -321,49 +355,49 @@ class BattleApplication:
                     if move:
                         effective_power = game_logic.get_effective_move_power(move, p)
                         scaled_tag = " (scaled)" if getattr(move, 'scale_with_hp', False) else ""
-                        print(f"  {ability:15} - Power:{int(effective_power):3}{scaled_tag} [{move.type:8}] ({move.damage_category})")
+                        log(f"  {ability:15} - Power:{int(effective_power):3}{scaled_tag} [{move.type:8}] ({move.damage_category})")
                     else:
-                        print(f"  {ability:15} - (No move data)")
+                        log(f"  {ability:15} - (No move data)")
             else:
-                print("  None")
+                log("  None")
         else:
-            print("  No Pokémon selected. Use 'setup' to choose your Pokémon.")
-        print("="*60 + "\n")
+            log("  No Pokémon selected. Use 'setup' to choose your Pokémon.")
+        log("="*60 + "\n")
 
     def _handle_status(self):
         """Show current battle status."""
         if not self.state_machine:
-            print("[App] No active state machine")
+            log("[App] No active state machine")
             return
 
-        print("\n" + "="*60)
-        print("BATTLE STATUS:")
-        print("="*60)
-        print(f"Role: {self.state_machine.role}")
-        print(f"State: {self.state_machine.state}")
-        print(f"Turn Owner: {self.state_machine.turn_owner}")
-        print(f"Peer Address: {self.state_machine.peer_addr}")
-        print(f"Running: {self.state_machine.running}")
+        log("\n" + "="*60)
+        log("BATTLE STATUS:")
+        log("="*60)
+        log(f"Role: {self.state_machine.role}")
+        log(f"State: {self.state_machine.state}")
+        log(f"Turn Owner: {self.state_machine.turn_owner}")
+        log(f"Peer Address: {self.state_machine.peer_addr}")
+        log(f"Running: {self.state_machine.running}")
 
         if self.state_machine.local_pokemon:
             p = self.state_machine.local_pokemon
-            print(f"\nYour Pokémon: {p.name}")
-            print(f"  HP: {p.hp}/{p.max_hp}")
-            print(f"  Special Attack Boosts: {p.special_attack_uses}")
-            print(f"  Special Defense Boosts: {p.special_defense_uses}")
+            log(f"\nYour Pokémon: {p.name}")
+            log(f"  HP: {p.hp}/{p.max_hp}")
+            log(f"  Special Attack Boosts: {p.special_attack_uses}")
+            log(f"  Special Defense Boosts: {p.special_defense_uses}")
 
         if self.state_machine.remote_pokemon:
             p = self.state_machine.remote_pokemon
-            print(f"\nOpponent's Pokémon: {p.name}")
-            print(f"  HP: {p.hp}/{p.max_hp}")
+            log(f"\nOpponent's Pokémon: {p.name}")
+            log(f"  HP: {p.hp}/{p.max_hp}")
 
-        print(f"\nSpectators: {len(self.state_machine.spectators)}")
-        print("="*60 + "\n")
+        log(f"\nSpectators: {len(self.state_machine.spectators)}")
+        log("="*60 + "\n")
 
     def run(self):
         """Start the application."""
         if not self.state_machine:
-            print("[App] Error: must call setup() before run().")
+            log("[App] Error: must call setup() before run().")
             return
 
         # Start network loop in separate thread
@@ -387,37 +421,39 @@ class BattleApplication:
 
     def cleanup(self):
         """Cleanup resources."""
-        print("[App] Cleaning up...")
+        log("[App] Cleaning up...")
         self.running = False
 
-        # Allow loops to notice running=False
-        time.sleep(0.05)
+        # Let the network loop notice running=False before its socket closes;
+        # it checks at least once per MAX_RECEIVE_WAIT.
+        if self._network_thread and self._network_thread is not threading.current_thread():
+            self._network_thread.join(timeout=1.0)
 
         if self.transport:
             try:
                 self.transport.close()
             except Exception as e:
-                print(f"[App] Error closing transport: {e}")
+                log(f"[App] Error closing transport: {e}")
 
         if self.broadcast:
             try:
                 self.broadcast.close()
             except Exception as e:
-                print(f"[App] Error closing broadcast: {e}")
+                log(f"[App] Error closing broadcast: {e}")
 
-        print("[App] Goodbye!")
+        log("[App] Goodbye!")
 
 
 def discover_games():
     """Discover available games on the network."""
-    print("message_type: BROADCAST_SEARCH\ntimeout: 3.0")
+    log("message_type: BROADCAST_SEARCH\ntimeout: 3.0")
 
     broadcast = BroadcastDiscovery(port=BROADCAST_PORT)
     try:
         # JOINER: open in listen-only mode to receive broadcasts
         broadcast.open(listen_only=True)
     except Exception as e:
-        print(f"message_type: BROADCAST_ERROR\nerror: discovery failed: {e}")
+        log(f"message_type: BROADCAST_ERROR\nerror: discovery failed: {e}")
         return None
 
     games = broadcast.listen_for_games(timeout=3.0)
@@ -425,79 +461,79 @@ def discover_games():
     broadcast.close()
 
     if not games:
-        print("message_type: NO_GAMES_FOUND")
+        log("message_type: NO_GAMES_FOUND")
         return None
 
-    print(f"\nmessage_type: GAMES_DISCOVERED")
-    print(f"count: {len(games)}")
+    log(f"\nmessage_type: GAMES_DISCOVERED")
+    log(f"count: {len(games)}")
     for i, (host_name, ip, port) in enumerate(games, 1):
-        print(f"game_{i}_host: {host_name}")
-        print(f"game_{i}_ip: {ip}")
-        print(f"game_{i}_port: {port}")
+        log(f"game_{i}_host: {host_name}")
+        log(f"game_{i}_ip: {ip}")
+        log(f"game_{i}_port: {port}")
 
     try:
-        choice_raw = input("Enter game number to join (0 to cancel): ").strip()
+        choice_raw = prompt("Enter game number to join (0 to cancel): ").strip()
         if choice_raw == "":
-            print("[Discovery] No selection made.")
+            log("[Discovery] No selection made.")
             return None
         choice = int(choice_raw)
         if choice == 0:
-            print("[Discovery] Cancelled.")
+            log("[Discovery] Cancelled.")
             return None
         if 1 <= choice <= len(games):
             host_name, ip, port = games[choice - 1]
-            print(f"[Discovery] Joining '{host_name}' at {ip}:{port}...")
+            log(f"[Discovery] Joining '{host_name}' at {ip}:{port}...")
             return ip, port  # Return (ip, port)
         else:
-            print(f"[Discovery] Invalid choice. Must be between 1 and {len(games)}.")
+            log(f"[Discovery] Invalid choice. Must be between 1 and {len(games)}.")
             return None
     except (ValueError, IndexError, EOFError, KeyboardInterrupt):
-        print("[Discovery] Invalid selection or cancelled.")
+        log("[Discovery] Invalid selection or cancelled.")
         return None
 
 
 def main():
     """Main entry point."""
-    print("="*60)
-    print(" POKEPROTOCOL - PEER-TO-PEER POKÉMON BATTLE")
-    print("="*60)
-    print("\nSelect mode:")
-    print("  1. Host a game")
-    print("  2. Join a game (Broadcast)")
-    print("  3. Join a game (P2P)")
-    print("  4. Spectate a game (Broadcast)")
-    print("  0. Exit")
+    log("="*60)
+    log(" POKEPROTOCOL - PEER-TO-PEER POKÉMON BATTLE")
+    log("="*60)
+    log("\nSelect mode:")
+    log("  1. Host a game")
+    log("  2. Join a game (Broadcast)")
+    log("  3. Join a game (P2P)")
+    log("  4. Spectate a game (Broadcast)")
+    log("  0. Exit")
 
     try:
-        choice = input("\nChoice: ").strip()
+        choice = prompt("\nChoice: ").strip()
     except (EOFError, KeyboardInterrupt):
-        print("\nExiting...")
+        log("\nExiting...")
         return
 
     app = BattleApplication()
 
     if choice == "0":
-        print("Exiting...")
+        log("Exiting...")
         return
 
     # Get player name
     try:
-        name = input("Enter your name: ").strip()
+        name = prompt("Enter your name: ").strip()
         if name:
             app.player_name = name
     except (EOFError, KeyboardInterrupt):
-        print("\nExiting...")
+        log("\nExiting...")
         return
 
     if choice == "1":
         # Host mode
         try:
-            port = int(input("Enter port to host on (default 5555): ") or "5555")
+            port = int(prompt("Enter port to host on (default 5555): ") or "5555")
         except ValueError:
             port = 5555
 
-        print(f"\n[Host] Starting game on port {port}...")
-        print("[Host] Waiting for opponent to join...")
+        log(f"\n[Host] Starting game on port {port}...")
+        log("[Host] Waiting for opponent to join...")
 
         app.setup("HOST", port)
         app.run()
@@ -509,31 +545,31 @@ def main():
             host_ip, host_port = result
             local_port = 5557  # Different port than host
 
-            print(f"\n[Join] Connecting to {host_ip}:{host_port}...")
+            log(f"\n[Join] Connecting to {host_ip}:{host_port}...")
             app.setup("JOINER", local_port, host_ip, host_port)
             app.run()
         else:
-            print("No game selected.")
+            log("No game selected.")
 
     elif choice == "3":
         # Join mode with manual IP
         try:
-            host_ip = input("Enter host IP address: ").strip()
+            host_ip = prompt("Enter host IP address: ").strip()
             if not host_ip:
-                print("No IP address provided.")
+                log("No IP address provided.")
                 return
-            host_port = int(input("Enter host port: ").strip())
-            local_port = int(input("Enter your local port (default 5557): ") or "5557")
+            host_port = int(prompt("Enter host port: ").strip())
+            local_port = int(prompt("Enter your local port (default 5557): ") or "5557")
         except (ValueError, EOFError, KeyboardInterrupt):
-            print("Invalid input.")
+            log("Invalid input.")
             return
 
         # Normalize invalid/unspecified remote IP
         if host_ip in ("0.0.0.0", "::", ""):  # 0.0.0.0 is not a valid remote target
-            print("[Join] '0.0.0.0' is not a valid remote target. Using 127.0.0.1.")
+            log("[Join] '0.0.0.0' is not a valid remote target. Using 127.0.0.1.")
             host_ip = "127.0.0.1"
 
-        print(f"\n[Join] Connecting to {host_ip}:{host_port}...")
+        log(f"\n[Join] Connecting to {host_ip}:{host_port}...")
         app.setup("JOINER", local_port, host_ip, host_port)
         app.run()
 
@@ -543,14 +579,14 @@ def main():
         if result:
             host_ip, host_port = result
             local_port = 5558  # Default spectator local port
-            print(f"\n[Spectate] Connecting to {host_ip}:{host_port}...")
+            log(f"\n[Spectate] Connecting to {host_ip}:{host_port}...")
             app.setup("SPECTATOR", local_port, host_ip, host_port)
             app.run()
         else:
-            print("No game selected.")
+            log("No game selected.")
 
     else:
-        print("Invalid choice. Exiting...")
+        log("Invalid choice. Exiting...")
 
 
 if __name__ == "__main__":
@@ -8,6 +8,7 @@ import socket
 import time
 from typing import Optional, Tuple, List
 from .message import encode_message, decode_message
+from .console import log
 
 class BroadcastDiscovery:
     """Handles UDP broadcast for game discovery on local network."""
@@ -47,18 +48,18 @@ class BroadcastDiscovery:
         if listen_only:
             try:
                 self.socket.bind(("", self.port))
-                print(f"message_type: BROADCAST_INIT\nmode: listen\nport: {self.port}")
+                log(f"message_type: BROADCAST_INIT\nmode: listen\nport: {self.port}")
             except OSError as e:
-                print(f"message_type: BROADCAST_ERROR\nerror: bind failed on port {self.port}: {e}")
+                log(f"message_type: BROADCAST_ERROR\nerror: bind failed on port {self.port}: {e}")
         else:
-            print(f"message_type: BROADCAST_INIT\nmode: send_only\nport: {self.port}")
+            log(f"message_type: BROADCAST_INIT\nmode: send_only\nport: {self.port}")
 
         self.socket.settimeout(0.1)
 
     def announce_game(self, host_name: str, game_port: int) -> bool:
         """Broadcast a GAME_ANNOUNCEMENT packet."""
         if not self.socket:
-            print("[Broadcast] Socket not initialized")
+            log("[Broadcast] Socket not initialized")
             return False
 
         message = encode_message({
@@ -71,21 +72,21 @@ class BroadcastDiscovery:
             self.socket.sendto(message, ("<broadcast>", self.port))
             return True
         except Exception as e:
-            print(f"[Broadcast] Error announcing game: {e}")
+            log(f"[Broadcast] Error announcing game: {e}")
             return False
 
     def listen_for_games(self, timeout: float = 5.0) -> List[Tuple[str, str, int]]:
         """Listen for announcements and return available games."""
         if not self.socket:
-            print("[Broadcast] Socket not initialized")
+            log("[Broadcast] Socket not initialized")
             return []
         
         # Only listen if opened in listen_only mode
         if not self.listen_only:
-            print("[Broadcast] Socket not in listen mode. Skipping listen_for_games().")
+            log("[Broadcast] Socket not in listen mode. Skipping listen_for_games().")
             return []
 
-        print(f"[Broadcast] Listening for games for {timeout}s...")
+        log(f"[Broadcast] Listening for games for {timeout}s...")
 
         games = []
         start_time = time.time()
@@ -104,12 +105,12 @@ class BroadcastDiscovery:
                     # Only add if we haven't seen this exact game before
                     if not any(g[1] == ip and g[2] == game_port for g in games):
                         games.append((host_name, ip, game_port))
-                        print(f"[Broadcast] Found game: {host_name} @ {ip}:{game_port}")
+                        log(f"[Broadcast] Found game: {host_name} @ {ip}:{game_port}")
 
             except socket.timeout:
                 pass
             except Exception as e:
-                print(f"[Broadcast] Error receiving: {e}")
+                log(f"[Broadcast] Error receiving: {e}")
 
         return games
 
@@ -117,4 +118,4 @@ class BroadcastDiscovery:
         if self.socket:
             self.socket.close()
             self.socket = None
-            print("[Broadcast] Socket closed")
\ No newline at end of file
+            log("[Broadcast] Socket closed")
\ No newline at end of file
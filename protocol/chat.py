@@ -25,6 +25,8 @@ import io
 from typing import Dict, Tuple
 from PIL import Image
 
+from .console import log
+
 
 class StickerValidationError(Exception):
     """Raised when sticker doesn't meet RFC requirements."""
@@ -67,11 +69,9 @@ def make_text_message(sender_name: str, text: str) -> Dict:
     }
 
 
-def make_sticker_message(sender_name: str, raw_bytes: bytes) -> Dict:
+def encode_sticker(raw_bytes: bytes) -> bytes:
     """
-    Build the RFC-compliant CHAT_MESSAGE dictionary for STICKER.
-    Converts binary sticker data into Base64 string.
-    Validates sticker before encoding.
+    Validate a sticker and return its Base64 encoding as ASCII bytes.
     
     Raises StickerValidationError if sticker doesn't meet requirements.
     """
@@ -80,12 +80,25 @@ def make_sticker_message(sender_name: str, raw_bytes: bytes) -> Dict:
     if not is_valid:
         raise StickerValidationError(error_msg)
     
-    sticker_data = base64.b64encode(raw_bytes).decode("utf-8")
+    sticker_data = base64.b64encode(raw_bytes)
     
     # RFC warns about messages over 1.5KB (IP fragmentation)
     estimated_size = len(sticker_data) + 200  # overhead for message fields
     if estimated_size > 1500:
-        print(f"[CHAT WARNING] Sticker message is {estimated_size} bytes, may cause IP fragmentation")
+        log(f"[CHAT WARNING] Sticker message is {estimated_size} bytes, may cause IP fragmentation")
+    
+    return sticker_data
+
+
+def make_sticker_message(sender_name: str, raw_bytes: bytes) -> Dict:
+    """
+    Build the RFC-compliant CHAT_MESSAGE dictionary for STICKER.
+    Converts binary sticker data into Base64 string.
+    Validates sticker before encoding.
+    
+    Raises StickerValidationError if sticker doesn't meet requirements.
+    """
+    sticker_data = encode_sticker(raw_bytes).decode("utf-8")
     
     return {
         "message_type": "CHAT_MESSAGE",
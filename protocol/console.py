@@ -0,0 +1,84 @@
+"""
+protocol/console.py
+
+Buffered console output for the protocol layer.
+
+The network thread prints several lines for every frame it handles. Calling
+print() for each one takes the stdout lock and flushes per line, which puts
+the state machine behind whatever else is writing to the terminal. log()
+only appends to a ring buffer; a daemon thread drains it and writes the
+lines out in bursts.
+
+The rest of the protocol package and main.py write through log() as well,
+and main.py calls flush() before every prompt, so lines reach the terminal
+in the order they were produced.
+
+This module DOES NOT:
+- format protocol messages (callers pass finished text, as with print)
+- replace the interactive prompts in main.py
+"""
+
+import atexit
+import collections
+import sys
+import threading
+
+# Oldest lines are dropped if the terminal cannot keep up.
+_lines = collections.deque(maxlen=4096)
+_wake = threading.Event()
+_write_lock = threading.Lock()
+_drainer = None
+_start_lock = threading.Lock()
+
+
+def log(*args, sep: str = " ", end: str = "\n"):
+    """
+    Queue a line for output. Same calling convention as print(), but args
+    are converted with str() later, on the drain thread, so pass values that
+    will not be mutated afterwards.
+    """
+    _lines.append((args, sep, end))
+    if _drainer is None:
+        _start_drainer()
+    # Event.set() takes a lock; skip it while a wake-up is already pending.
+    # The drainer clears the flag before draining, so a line appended after
+    # that either is drained in the same pass or sets the flag again.
+    if not _wake.is_set():
+        _wake.set()
+
+
+def flush():
+    """Write out everything queued so far."""
+    with _write_lock:
+        chunks = []
+        append = chunks.append
+        popleft = _lines.popleft
+        try:
+            while True:
+                args, sep, end = popleft()
+                append(sep.join(map(str, args)))
+                append(end)
+        except IndexError:
+            pass
+        if chunks:
+            out = sys.stdout
+            out.write("".join(chunks))
+            out.flush()
+
+
+def _drain_loop():
+    while True:
+        _wake.wait()
+        _wake.clear()
+        flush()
+
+
+def _start_drainer():
+    global _drainer
+    with _start_lock:
+        if _drainer is None:
+            _drainer = threading.Thread(target=_drain_loop, name="console-drain", daemon=True)
+            _drainer.start()
+
+
+atexit.register(flush)
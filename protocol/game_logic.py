@@ -20,12 +20,14 @@ It is used by the state machine to compute damage,
 synchronize battle state, and check victory conditions.
 """
 
+import csv
 import json
 import random
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
 
 from .pokemon_database import PokemonDatabase, PokemonStats
+from .console import log
 
 # ============================================================
 # RNG SYNC UTILITIES
@@ -66,6 +68,11 @@ class Move:
     hp_ratio: float = 0.5
     power_min: float = 35.0
     power_max: float = 110.0
+    # Lower-cased type, the key into BattlePokemon.effectiveness
+    type_key: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.type_key = self.type.lower()
 
 
 # ============================================================
@@ -79,11 +86,17 @@ def get_effective_move_power(move: Move, attacker: "BattlePokemon") -> float:
             clamped to [power_min, power_max].
         - Otherwise returns move.power as-is.
         """
-        if getattr(move, 'scale_with_hp', False):
-                scaled = attacker.max_hp * getattr(move, 'hp_ratio', 0.5)
-                pmin = getattr(move, 'power_min', 35.0)
-                pmax = getattr(move, 'power_max', 110.0)
-                return max(pmin, min(pmax, scaled))
+        # Move is a dataclass, so the scaling fields always exist (with
+        # defaults) and can be read directly.
+        if move.scale_with_hp:
+                scaled = attacker.max_hp * move.hp_ratio
+                pmin = move.power_min
+                pmax = move.power_max
+                if scaled < pmin:
+                        return pmin
+                if scaled > pmax:
+                        return pmax
+                return scaled
         return move.power
 
 
@@ -108,8 +121,27 @@ class BattlePokemon:
     special_defense_uses: int = 0
     effectiveness: Dict[str, float] = None
 
+    # (mutable-stat key, serialized JSON) from the last to_json() call
+    _json_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    # Lower-cased abilities, built on first has_ability() call
+    _ability_set: Optional[frozenset] = field(default=None, init=False, repr=False, compare=False)
+
+    def has_ability(self, name: str) -> bool:
+        """Case-insensitive ability check; name must already be lower case."""
+        abilities = self._ability_set
+        if abilities is None:
+            abilities = self._ability_set = frozenset(a.lower() for a in self.abilities or ())
+        return name in abilities
+
     def to_json(self) -> str:
-        return json.dumps({
+        # Only hp, the special stats and their boost counters change during a
+        # battle, so re-serialize only when one of them has moved.
+        key = (self.hp, self.special_attack, self.special_defense,
+               self.special_attack_uses, self.special_defense_uses)
+        cached = self._json_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        s = json.dumps({
             "name": self.name,
             "max_hp": self.max_hp,
             "hp": self.hp,
@@ -121,7 +153,9 @@ class BattlePokemon:
             "special_attack_uses": self.special_attack_uses,
             "special_defense_uses": self.special_defense_uses,
             "effectiveness": self.effectiveness,
-        })
+        }, separators=(",", ":"))
+        self._json_cache = (key, s)
+        return s
 
     @staticmethod
     def from_json(s: str):
@@ -143,6 +177,11 @@ class BattlePokemon:
     def is_fainted(self) -> bool:
         return self.hp <= 0
 
+    def apply_damage(self, dmg: int) -> int:
+        """Subtract dmg from hp, clamped at 0. Returns the new hp."""
+        self.hp = max(0, self.hp - dmg)
+        return self.hp
+
     def apply_sp_atk_boost(self):
         if self.special_attack_uses > 0:
             self.special_attack_uses -= 1
@@ -170,6 +209,25 @@ def get_type_effectiveness(move_type: str, defender: BattlePokemon) -> float:
 # DAMAGE FORMULA
 # ============================================================
 
+def consume_stat_boosts(attacker: BattlePokemon, defender: BattlePokemon, move: Move) -> Tuple[float, float]:
+    """
+    Consume one special attack / special defense use for a SPECIAL move.
+    Returns the (attacker, defender) stat multipliers that apply this turn.
+
+    Split out of calculate_damage so a peer that mirrors a report instead of
+    recomputing it keeps the same boost counters as the peer that computed it.
+    """
+    atk_mult = def_mult = 1.0
+    if move.damage_category == "special":
+        if attacker.special_attack_uses > 0:
+            attacker.special_attack_uses -= 1
+            atk_mult = 1.3
+        if defender.special_defense_uses > 0:
+            defender.special_defense_uses -= 1
+            def_mult = 1.3
+    return atk_mult, def_mult
+
+
 def calculate_damage(attacker: BattlePokemon, defender: BattlePokemon, move: Move) -> int:
     """
     RFC Section 6 Damage Calculation Formula:
@@ -198,29 +256,26 @@ def calculate_damage(attacker: BattlePokemon, defender: BattlePokemon, move: Mov
         atk_stat = attacker.attack
         def_stat = defender.defense
         # Ability: Huge Power (physical only)
-        if attacker.abilities and any(a.lower() == 'huge power' for a in attacker.abilities):
+        if attacker.has_ability('huge power'):
             atk_stat *= 2
     else:
         atk_stat = attacker.special_attack
         def_stat = defender.special_defense
 
     # Apply boosts for special moves only (consume uses and apply multiplier)
-    if move.damage_category == "special":
-        if attacker.special_attack_uses > 0:
-            attacker.special_attack_uses -= 1
-            atk_stat *= 1.3
-        if defender.special_defense_uses > 0:
-            defender.special_defense_uses -= 1
-            def_stat *= 1.3
+    atk_mult, def_mult = consume_stat_boosts(attacker, defender, move)
+    atk_stat *= atk_mult
+    def_stat *= def_mult
 
     def_stat = max(def_stat, 1)
 
-    # Get type effectiveness from CSV (combines both types automatically)
-    type_effectiveness = get_type_effectiveness(move.type, defender)
+    # Get type effectiveness from CSV (combines both types automatically).
+    # Same lookup as get_type_effectiveness, with the key lowered once per Move.
+    type_effectiveness = defender.effectiveness.get(move.type_key, 1.0)
 
     # Ability: Thick Fat (fire/ice)
-    if defender.abilities and any(a.lower() == 'thick fat' for a in defender.abilities):
-        if move.type.lower() in {'fire', 'ice'}:
+    if defender.has_ability('thick fat'):
+        if move.type_key in {'fire', 'ice'}:
             type_effectiveness *= 0.5
 
     # Compute effective power via shared helper
@@ -265,10 +320,10 @@ def initialize_databases(pokemon_csv: str = "pokemon.csv", verbose: bool = False
             }
 
         if verbose:
-            print(f"[Game] Loaded {len(POKEMON_DB)} Pokémon from CSV with defensive charts")
+            log(f"[Game] Loaded {len(POKEMON_DB)} Pokémon from CSV with defensive charts")
 
     except Exception as e:
-        print(f"[Error] Failed loading Pokémon CSV: {e}")
+        log(f"[Error] Failed loading Pokémon CSV: {e}")
         POKEMON_DB.clear()
 
     load_moves_from_pokemon_csv(pokemon_csv, verbose=verbose)
@@ -368,9 +423,6 @@ def load_moves_from_pokemon_csv(pokemon_csv: str = "pokemon.csv", verbose: bool
     global MOVES_DB
     MOVES_DB.clear()
     
-    import csv
-    import json
-    
     try:
         with open(pokemon_csv, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
@@ -441,13 +493,13 @@ def load_moves_from_pokemon_csv(pokemon_csv: str = "pokemon.csv", verbose: bool
                         )
         
         if verbose:
-            print(f"[Game] Loaded {len(MOVES_DB)} moves from Pokemon CSV abilities")
+            log(f"[Game] Loaded {len(MOVES_DB)} moves from Pokemon CSV abilities")
     
     except Exception as e:
-        print(f"[Error] Failed loading moves from CSV: {e}")
+        log(f"[Error] Failed loading moves from CSV: {e}")
         create_default_moves()
         if verbose:
-            print(f"[Game] Using default moves ({len(MOVES_DB)})")
+            log(f"[Game] Using default moves ({len(MOVES_DB)})")
 
 
 def create_default_moves():
@@ -12,6 +12,8 @@ All values are treated as strings. Use helpers to convert fields like
 sequence_number to/from integers where needed.
 """
 
+import sys
+from collections import namedtuple
 from typing import Dict, List, Tuple, Optional
 
 
@@ -19,6 +21,11 @@ class MessageParseError(ValueError):
     pass
 
 
+# Enumerated fields whose values are interned on decode, so consumers can
+# compare them against interned constants by identity.
+INTERNED_FIELDS = ("message_type", "content_type")
+
+
 def encode_message(fields: Dict[str, str]) -> bytes:
     """
     Encode a mapping of key -> value into the RFC plain-text format.
@@ -40,6 +47,20 @@ def encode_message(fields: Dict[str, str]) -> bytes:
     return text.encode("utf-8")
 
 
+def encode_message_with_blob(fields: Dict[str, str], key: str, blob: bytes) -> bytes:
+    """
+    Encode fields as encode_message does, then append a final `key: blob`
+    line where blob is already-encoded bytes (e.g. Base64 sticker data).
+
+    The blob is copied once into the frame instead of round-tripping through
+    str, which matters for multi-KB sticker payloads.
+    """
+    if b"\n" in blob:
+        raise ValueError("blob must not contain newlines")
+    head = encode_message(fields)
+    return b"".join((head, b"\n", key.encode("utf-8"), b": ", blob))
+
+
 def decode_message(data: bytes) -> Dict[str, str]:
     """
     Decode bytes (utf-8) into a dict of key -> value.
@@ -54,20 +75,23 @@ def decode_message(data: bytes) -> Dict[str, str]:
     if text == "":
         return msg
 
+    # One partition() per well-formed line; the blank-line and "key:value"
+    # checks only run when the ": " separator is missing.
     for lineno, raw in enumerate(text.splitlines(), start=1):
-        # Allow blank lines (skip)
-        if not raw.strip():
-            continue
-        if ": " not in raw:
+        k, sep, v = raw.partition(": ")
+        if not sep:
+            # Allow blank lines (skip)
+            if not raw.strip():
+                continue
             # Be permissive: also accept "key:value" (no space) but warn via exception.
-            if ":" in raw:
-                k, v = raw.split(":", 1)
-                msg[k.strip()] = v.strip()
-            else:
+            k, sep, v = raw.partition(":")
+            if not sep:
                 raise MessageParseError(f"Malformed line {lineno}: '{raw}' (expected 'key: value')")
-        else:
-            k, v = raw.split(": ", 1)
-            msg[k.strip()] = v.strip()
+        msg[k.strip()] = v.strip()
+    for k in INTERNED_FIELDS:
+        v = msg.get(k)
+        if v is not None:
+            msg[k] = sys.intern(v)
     return msg
 
 
@@ -82,6 +106,24 @@ def require_fields(msg: Dict[str, str], required: List[str]) -> Tuple[bool, Opti
     return True, None
 
 
+def compile_validator(required: List[str]):
+    """
+    Build a require_fields() equivalent specialized for one message schema.
+    The per-field checks are unrolled into generated code once, so a call
+    runs no Python-level loop over `required`.
+    Returns a function msg -> (ok, missing_field_name).
+    """
+    lines = ["def _validate(msg):"]
+    for f in required:
+        if not isinstance(f, str):
+            raise TypeError("required field names must be strings")
+        lines.append(f"    if {f!r} not in msg: return False, {f!r}")
+    lines.append("    return True, None")
+    namespace: Dict[str, object] = {}
+    exec("\n".join(lines), namespace)
+    return namespace["_validate"]
+
+
 def parse_int_field(msg: Dict[str, str], field: str, default: Optional[int] = None) -> Optional[int]:
     """
     Parse integer field safely. Returns an integer or default.
@@ -98,13 +140,51 @@ def parse_int_field(msg: Dict[str, str], field: str, default: Optional[int] = No
         raise MessageParseError(f"Field '{field}' is not a valid integer: '{raw}'")
 
 
+# Parsed CALCULATION_REPORT. Numeric fields are ints so reports can be
+# compared field-by-field without further conversion.
+CalcReport = namedtuple(
+    "CalcReport",
+    "attacker move_used remaining_health damage_dealt defender_hp_remaining status_message",
+)
+
+
+def parse_calc_report(msg: Dict[str, str]) -> CalcReport:
+    """
+    Build a CalcReport from a decoded CALCULATION_REPORT.
+    Raises MessageParseError if a numeric field is not an integer.
+    """
+    # One pass, one handler: absent or blank fields become None, as with
+    # parse_int_field.
+    get = msg.get
+    try:
+        remaining, damage, defender_hp = [
+            int(raw) if raw and not raw.isspace() else None
+            for raw in (get("remaining_health"), get("damage_dealt"), get("defender_hp_remaining"))
+        ]
+    except ValueError as e:
+        raise MessageParseError(f"CALCULATION_REPORT has a non-integer field: {e}")
+    return CalcReport(
+        get("attacker"),
+        get("move_used"),
+        remaining,
+        damage,
+        defender_hp,
+        get("status_message"),
+    )
+
+
 # Convenience factories for common messages (small helpers)
 def mk_handshake_response(seed: int) -> bytes:
     return encode_message({"message_type": "HANDSHAKE_RESPONSE", "seed": str(seed)})
 
 
+# ACK frame, byte-for-byte what encode_message produces for it. ACKs are
+# sent for every sequenced frame, so they skip the dict/str/encode path.
+_ACK_TEMPLATE = b"message_type: ACK\nack_number: %d"
+
+
 def mk_ack(ack_number: int) -> bytes:
-    return encode_message({"message_type": "ACK", "ack_number": str(ack_number)})
+    return _ACK_TEMPLATE % ack_number
 
 
 def mk_chat_text(sender_name: str, message_text: str, sequence_number: Optional[int] = None) -> bytes:
@@ -9,6 +9,8 @@ import os
 from typing import Dict, Optional, List
 from dataclasses import dataclass
 
+from .console import log
+
 
 @dataclass
 class PokemonStats:
@@ -148,11 +150,11 @@ class PokemonDatabase:
 
                 except (ValueError, KeyError) as e:
                     if self.verbose:
-                        print(f"[PokemonDatabase] Skipping row {row_num}: {e}")
+                        log(f"[PokemonDatabase] Skipping row {row_num}: {e}")
                     continue
             
             if self.verbose:
-                print(f"[PokemonDatabase] Loaded {loaded_count} Pokémon from {path}")
+                log(f"[PokemonDatabase] Loaded {loaded_count} Pokémon from {path}")
     
     def get_pokemon(self, name: str) -> Optional[PokemonStats]:
         """
@@ -18,13 +18,16 @@ This module does NOT understand:
 It only ensures messages eventually arrive or the connection fails.
 """
 
+import threading
 import time
 from typing import Dict, Tuple, Optional, Any, List
 
 try:
-    from .message import encode_message
+    from .message import encode_message, mk_ack
+    from .udp_transport import send_frames
 except ImportError:
-    from protocol.message import encode_message
+    from protocol.message import encode_message, mk_ack
+    from protocol.udp_transport import send_frames
 
 
 class ReliabilityError(Exception):
@@ -33,13 +36,28 @@ class ReliabilityError(Exception):
 
 
 class ReliabilityLayer:
-    def __init__(self, timeout: float = 0.5, max_retries: int = 3):
+    def __init__(self, timeout: float = 0.5, max_retries: int = 3, ack_delay: float = 0.0):
         self.timeout = timeout
         self.max_retries = max_retries
+        # With ack_delay > 0, ACKs are held for up to that many seconds and
+        # flushed together from tick(); repeat copies of a frame that arrive
+        # in the window (retransmits) then cost a single ACK.
+        self.ack_delay = ack_delay
+        # addr -> sequence numbers waiting to be ACKed
+        self._pending_acks: Dict[Tuple[str, int], set] = {}
+        self._acks_due = 0.0
 
         self._seq = 0  # local sequence counter
+        # Guards only _seq: the UI thread draws numbers for chat/attacks while
+        # the network thread draws them for replies and advances _seq to the
+        # peer's. Nothing else in the layer is held under it.
+        self._seq_lock = threading.Lock()
         # pending: (seq_number, addr) -> (msg_bytes, addr, last_sent_time, retries)
         self.pending: Dict[Tuple[int, Tuple[str, int]], Tuple[bytes, Tuple[str, int], float, int]] = {}
+        # No pending entry can time out before this; tick() skips its scan
+        # until then. Never later than last scan + timeout, which also covers
+        # entries added (from any thread) after that scan.
+        self._next_due = 0.0
 
     # ------------------------------
     #  Sequence number management
@@ -47,8 +65,9 @@ class ReliabilityLayer:
 
     def next_sequence_number(self) -> int:
         """Return the next sequence number and increment internal counter."""
-        self._seq += 1
-        return self._seq
+        with self._seq_lock:
+            self._seq += 1
+            return self._seq
 
     # ------------------------------
     #  Message Send with Reliability
@@ -78,27 +97,30 @@ class ReliabilityLayer:
         seq = self.next_sequence_number()
         fields["sequence_number"] = seq
         msg_bytes = encode_message(fields)
-        now = time.time()
-        aggregate_ok = True
-        for addr in addrs:
-            ok = transport.send(msg_bytes, addr)
-            if not ok:
-                aggregate_ok = False
-            self.pending[(seq, addr)] = (msg_bytes, addr, now, 0)
+        aggregate_ok = self.track_and_send_existing(transport, msg_bytes, seq, addrs)
         return aggregate_ok, seq
 
+    def send_reliable_prefixed(self, transport, prefix: bytes, addrs: List[Tuple[str, int]]):
+        """
+        Send a frame whose fields are already encoded in prefix, appending only
+        the sequence_number line. For constant frames such as DEFENSE_ANNOUNCE.
+        Returns (aggregate_ok, seq).
+        """
+        seq = self.next_sequence_number()
+        msg_bytes = b"%s\nsequence_number: %d" % (prefix, seq)
+        ok = self.track_and_send_existing(transport, msg_bytes, seq, addrs)
+        return ok, seq
+
     def track_and_send_existing(self, transport, msg_bytes: bytes, seq: int, addrs: List[Tuple[str, int]]):
         """
         Send existing encoded message bytes (with an already-assigned sequence_number)
         to multiple addresses and track retransmissions per destination.
         """
+        aggregate_ok = send_frames(transport, [(msg_bytes, addr) for addr in addrs])
         now = time.time()
-        aggregate_ok = True
+        pending = self.pending
         for addr in addrs:
-            ok = transport.send(msg_bytes, addr)
-            if not ok:
-                aggregate_ok = False
-            self.pending[(seq, addr)] = (msg_bytes, addr, now, 0)
+            pending[(seq, addr)] = (msg_bytes, addr, now, 0)
         return aggregate_ok
 
     # ------------------------------
@@ -109,9 +131,8 @@ class ReliabilityLayer:
         """
         Remove acknowledged messages for the given source from pending queue.
         """
-        key = (ack_number, addr)
-        if key in self.pending:
-            del self.pending[key]
+        # One hash probe; a duplicate ACK finds nothing and is a no-op.
+        self.pending.pop((ack_number, addr), None)
 
     def maybe_send_ack(self, transport, seq: Optional[int], addr: Tuple[str, int]):
         """
@@ -119,12 +140,7 @@ class ReliabilityLayer:
         """
         if seq is None:
             return
-        ack_fields = {
-            "message_type": "ACK",
-            "ack_number": seq
-        }
-        ack_bytes = encode_message(ack_fields)
-        transport.send(ack_bytes, addr)
+        transport.send(mk_ack(seq), addr)
 
     # ------------------------------
     #  Incoming Message Handling
@@ -134,6 +150,7 @@ class ReliabilityLayer:
         """
         Called by the state machine when ANY message arrives.
         Extract sequence_number if present and automatically ACK it.
+        Returns the parsed sequence_number, or None if absent or malformed.
         """
         seq = msg.get("sequence_number")
         if seq is not None:
@@ -141,15 +158,44 @@ class ReliabilityLayer:
                 seq_int = int(seq)
             except ValueError:
                 # Ignore malformed
-                return
+                return None
             # Align local sequence to remote for a shared, monotonically
             # increasing sequence space across both peers.
             # This ensures the next locally sent message uses seq+1,
             # making sender and receiver views consistent.
             if seq_int > self._seq:
-                self._seq = seq_int
-
-            self.maybe_send_ack(transport, seq_int, addr)
+                with self._seq_lock:
+                    if seq_int > self._seq:
+                        self._seq = seq_int
+
+            if self.ack_delay > 0:
+                if not self._pending_acks:
+                    self._acks_due = time.time() + self.ack_delay
+                self._pending_acks.setdefault(addr, set()).add(seq_int)
+            else:
+                self.maybe_send_ack(transport, seq_int, addr)
+            return seq_int
+        return None
+
+    def next_deadline(self) -> Optional[float]:
+        """
+        Earliest time.time() at which tick() has work to do (held ACKs to
+        flush or a frame that may need retransmitting), or None if idle.
+        """
+        due = self._next_due if self.pending else None
+        if self._pending_acks and (due is None or self._acks_due < due):
+            due = self._acks_due
+        return due
+
+    def flush_acks(self, transport):
+        """Send every held ACK now, one per distinct (addr, sequence_number)."""
+        pending, self._pending_acks = self._pending_acks, {}
+        frames = [
+            (mk_ack(seq), addr)
+            for addr, seqs in pending.items()
+            for seq in sorted(seqs)
+        ]
+        send_frames(transport, frames)
 
     # ------------------------------
     #  Retransmission Timer
@@ -164,17 +210,33 @@ class ReliabilityLayer:
         now = time.time()
         to_delete = []
 
-        for key, (msg_bytes, addr, last, retries) in list(self.pending.items()):
-            if now - last > self.timeout:
-                if retries >= self.max_retries:
+        if self._pending_acks and now >= self._acks_due:
+            self.flush_acks(transport)
+
+        if now < self._next_due:
+            return
+
+        timeout = self.timeout
+        max_retries = self.max_retries
+        pending = self.pending
+        next_due = now + timeout
+        resend = []
+        for key, (msg_bytes, addr, last, retries) in list(pending.items()):
+            if now - last > timeout:
+                if retries >= max_retries:
                     raise ReliabilityError(
                         f"Message seq {key[0]} to {addr} exceeded max retries ({self.max_retries}). "
                         "Peer appears unresponsive."
                     )
 
-                # Retransmit
-                transport.send(msg_bytes, addr)
+                # Retransmit (batched below)
+                resend.append((msg_bytes, addr))
                 # Update tracking
-                self.pending[key] = (msg_bytes, addr, now, retries + 1)
+                pending[key] = (msg_bytes, addr, now, retries + 1)
+            elif last + timeout < next_due:
+                next_due = last + timeout
+        self._next_due = next_due
+        if resend:
+            send_frames(transport, resend)
 
         # No deletion here; ACKs delete entries
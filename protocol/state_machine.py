@@ -14,35 +14,132 @@ This module:
 - Processes battle logic events
 """
 
-import random
-from typing import Dict, Tuple, Optional, Any, List
+import json
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from typing import Dict, Tuple, Optional, Any, List, Set
 from .message import (
     decode_message,
     encode_message,
-    require_fields,
+    encode_message_with_blob,
+    compile_validator,
     parse_int_field,
+    parse_calc_report,
+    CalcReport,
+    MessageParseError,
 )
 from .reliability import ReliabilityLayer, ReliabilityError
+from .udp_transport import SendBatch
 from .game_logic import BattlePokemon, calculate_damage, Move
-from . import chat
+from . import chat, game_logic
+from .console import log
+
+
+# Per-message-type field validators, specialized once at import.
+_validate_handshake_response = compile_validator(["seed"])
+_validate_battle_setup = compile_validator(["pokemon", "pokemon_name"])
+_validate_attack_announce = compile_validator(["move_name"])
+_validate_calculation_report = compile_validator(
+    ["attacker", "move_used", "damage_dealt", "defender_hp_remaining"]
+)
+
+
+# Frames with no fields besides message_type, encoded once. Only the
+# sequence_number line is added per send (ReliabilityLayer.send_reliable_prefixed).
+_DEFENSE_ANNOUNCE = {"message_type": "DEFENSE_ANNOUNCE"}
+_DEFENSE_ANNOUNCE_BYTES = encode_message(_DEFENSE_ANNOUNCE)
+_CALCULATION_CONFIRM = {"message_type": "CALCULATION_CONFIRM"}
+_CALCULATION_CONFIRM_BYTES = encode_message(_CALCULATION_CONFIRM)
+
+# ATTACK_ANNOUNCE has one variable field; its frame is filled in with a single
+# bytes %-format rather than going through encode_message.
+_ATTACK_ANNOUNCE_TEMPLATE = b"message_type: ATTACK_ANNOUNCE\nmove_name: %s"
+
+
+# Enumerated values, interned to match decode_message so the hot-path checks
+# are identity compares.
+_MT_ACK = sys.intern("ACK")
+_MT_CHAT = sys.intern("CHAT_MESSAGE")
+_CT_TEXT = sys.intern("TEXT")
+_CT_STICKER = sys.intern("STICKER")
+
+
+# CHAT_MESSAGE fields read by _on_chat, fetched in one map(msg.get, ...) pass.
+_CHAT_FIELDS = ("sender_name", "content_type", "message_text", "sticker_data", "sequence_number")
+
+
+# Received stickers are decoded and written to disk here rather than on the
+# network thread.
+_sticker_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sticker-writer")
+
+
+def _log_sticker_saved(future):
+    try:
+        log(f"[SM] Sticker saved to {future.result()}")
+    except Exception as e:
+        log(f"[SM] Error saving sticker: {e}")
+
+
+class Turn(IntEnum):
+    """Whose turn it is. Values are 0/1 so they index _TURN_FLIP directly."""
+    LOCAL = 0
+    REMOTE = 1
+
+    def __str__(self):
+        return self.name
+
+
+# _TURN_FLIP[turn] is the other side's turn. A tuple index avoids going
+# through Turn(...), whose value lookup runs the EnumMeta machinery.
+_TURN_FLIP = (Turn.REMOTE, Turn.LOCAL)
 
 
 class ProtocolStateMachine:
+    # Fixed attribute set: no per-instance __dict__, and handler attribute
+    # loads resolve through slot descriptors.
+    __slots__ = (
+        "transport", "r", "role", "authoritative", "verify_every",
+        "local_name", "remote_name", "spectator_names",
+        "last_incoming_addr", "last_incoming_data", "last_incoming_seq", "peer_addr",
+        "local_pokemon", "remote_pokemon",
+        "turn_owner", "turns_played", "remote_move", "last_announced_move",
+        "last_calc_report_remote", "local_calc_report", "_peer_confirmed",
+        "_late_report_local", "spectators",
+        "_spectator_set",
+        "state", "running", "_recent_decodes", "_handled", "_status_messages",
+        "_headers", "_dispatch", "_send_reliable",
+    )
+
     # ----------------------------
     # Constructor
     # ----------------------------
-    def __init__(self, transport, reliability: ReliabilityLayer, role: str, local_name: str = "Player"):
+    def __init__(self, transport, reliability: ReliabilityLayer, role: str, local_name: str = "Player",
+                 authoritative: bool = True, verify_every: int = 5):
         """
         role: "HOST", "JOINER", or "SPECTATOR"
+        authoritative: whether this peer computes damage every turn, as the RFC
+            specifies. Opt-in False (for at most one peer, and only when both
+            run this implementation) makes it adopt the other side's
+            CALCULATION_REPORT and only recompute every `verify_every` turns.
         """
         self.transport = transport
         self.r = reliability
         self.role = role
+        self.authoritative: bool = authoritative
+        self.verify_every: int = max(1, verify_every)
+        self.turns_played: int = 0
         self.local_name: str = local_name
         self.remote_name: Optional[str] = None
         # Spectator naming and last-incoming tracking
         self.spectator_names: Dict[Tuple[str, int], str] = {}
         self.last_incoming_addr: Optional[Tuple[str, int]] = None
+        # Raw datagram being handled, so relays can forward it without re-encoding
+        self.last_incoming_data: Optional[bytes] = None
+        # Its sequence_number as parsed by the reliability layer (None if absent)
+        self.last_incoming_seq: Optional[int] = None
 
         # Remote peer address (filled after handshake)
         self.peer_addr: Optional[Tuple[str, int]] = None
@@ -51,8 +148,8 @@ class ProtocolStateMachine:
         self.local_pokemon: Optional[BattlePokemon] = None
         self.remote_pokemon: Optional[BattlePokemon] = None
 
-        # Whose turn? ("LOCAL" or "REMOTE")
-        self.turn_owner: Optional[str] = None
+        # Whose turn? (Turn.LOCAL or Turn.REMOTE)
+        self.turn_owner: Optional[Turn] = None
 
         # Last move from remote player
         self.remote_move: Optional[str] = None
@@ -61,48 +158,128 @@ class ProtocolStateMachine:
         self.last_announced_move: Optional[str] = None
 
         # Storage for last received calculation report
-        self.last_calc_report_remote: Optional[Dict[str, Any]] = None
-        self.local_calc_report: Optional[Dict[str, Any]] = None
+        self.last_calc_report_remote: Optional[CalcReport] = None
+        self.local_calc_report: Optional[CalcReport] = None
+        # Peer's CALCULATION_CONFIRM arrived before its own report
+        self._peer_confirmed: bool = False
+        # Our report from a turn the peer confirmed before its own report
+        # reached us; that report still needs an answer when it arrives
+        self._late_report_local: Optional[CalcReport] = None
 
         # Spectator list (for HOST)
+        # Only ever appended to (by _on_spectator_request on the network
+        # thread), so relay loops iterate it directly rather than a copy.
         self.spectators: List[Tuple[str, int]] = []
+        # Same addresses as a set, for O(1) membership checks. It stays a
+        # separate structure because a dict would raise if a UI-thread send
+        # iterated it while a join was inserting.
+        self._spectator_set: Set[Tuple[str, int]] = set()
 
         # Game state flags
         self.state = "SETUP"
         self.running = True
 
+        # Raw datagram -> decoded dict for the last few frames, so a peer's
+        # retransmits skip parsing. Handlers treat msg as read-only.
+        self._recent_decodes: "OrderedDict[bytes, Dict[str, str]]" = OrderedDict()
+
+        # (sender addr, sequence_number) -> datagram, for the last few handled
+        # frames. A byte-identical repeat is a retransmit whose ACK was lost.
+        self._handled: "OrderedDict[Tuple[Tuple[str, int], int], bytes]" = OrderedDict()
+
+        # (attacker name, move name) -> CALCULATION_REPORT status_message
+        self._status_messages: Dict[Tuple[str, str], str] = {}
+
+        # Sender address -> "[label]" header for printed incoming messages.
+        # Cleared whenever remote_name, peer_addr or spectator_names changes.
+        self._headers: Dict[Optional[Tuple[str, int]], str] = {}
+
+        # message_type -> handler(msg, addr)
+        self._dispatch = {
+            "ACK": self._on_ack,
+            "HANDSHAKE_REQUEST": self._on_handshake_request,
+            "HANDSHAKE_RESPONSE": self._on_handshake_response,
+            "SPECTATOR_REQUEST": self._on_spectator_request,
+            "BATTLE_SETUP": self._on_battle_setup,
+            "ATTACK_ANNOUNCE": self._on_attack_announce,
+            "DEFENSE_ANNOUNCE": self._on_defense_announce,
+            "CALCULATION_REPORT": self._on_calculation_report,
+            "CALCULATION_CONFIRM": self._on_calculation_confirm,
+            "RESOLUTION_REQUEST": self._on_resolution_request,
+            "GAME_OVER": self._on_game_over,
+            "CHAT_MESSAGE": self._on_chat,
+        }
+        # The role is fixed for the machine's lifetime, so handshake frames
+        # meant for the other role are dropped here instead of being checked
+        # inside each handler.
+        if role != "HOST":
+            del self._dispatch["HANDSHAKE_REQUEST"]
+        if role != "JOINER":
+            del self._dispatch["HANDSHAKE_RESPONSE"]
+
+        # Until the handshake fixes peer_addr every send must check it; after
+        # that the handshake handlers swap in _send_reliable_connected.
+        self._send_reliable = self._send_reliable_preconnect
+
     # ----------------------------
     # Helper for sending messages
     # ----------------------------
-    def _send_reliable(self, fields: Dict[str, Any]):
+    def _send_reliable_preconnect(self, fields: Dict[str, Any]):
         if not self.peer_addr:
             return False, None
+        return self._send_reliable_connected(fields)
+
+    def _send_reliable_connected(self, fields: Dict[str, Any]):
         # If HOST with spectators, send to peer and spectators with the same sequence_number
-        if self.role == "HOST" and self.spectators:
-            addrs = [self.peer_addr] + list(self.spectators)
-            ok, seq = self.r.send_reliable_to_many(self.transport, fields, addrs)
-            return ok, seq
-        else:
-            ok, seq = self.r.send_reliable(self.transport, fields, self.peer_addr)
-            return ok, seq
+        return self.r.send_reliable_to_many(self.transport, fields, self._destinations())
     
+    def _destinations(self) -> List[Tuple[str, int]]:
+        """Peer, plus every spectator when we are the HOST."""
+        if self.role == "HOST" and self.spectators:
+            return [self.peer_addr, *self.spectators]
+        return [self.peer_addr]
+
+    def _send_prefixed(self, fields: Dict[str, Any], encoded: bytes):
+        """
+        Send and print a frame whose fields are already encoded, minus the
+        sequence_number line (post-handshake only). fields is only printed.
+        """
+        ok, seq = self.r.send_reliable_prefixed(self.transport, encoded, self._destinations())
+        self._print_message(fields, seq)
+        return ok, seq
+
     def _print_message(self, fields: Dict[str, Any], seq: Optional[int] = None):
         """Print an outgoing message in RFC wire format with sequence_number if available."""
-        print(f"\n[{self.local_name}]")
+        lines = [f"\n[{self.local_name}]"]
         for key, value in fields.items():
             # Avoid double-printing sequence_number and avoid dumping full Pokémon stats
             if key == "sequence_number":
                 continue
             if key == "pokemon":
-                print("pokemon: [sent]")
+                lines.append("pokemon: [sent]")
                 continue
-            print(f"{key}: {value}")
+            lines.append(f"{key}: {value}")
         if seq is not None:
-            print(f"sequence_number: {seq}")
+            lines.append(f"sequence_number: {seq}")
+        log("\n".join(lines))
+
+    def _print_incoming(self, message_type: str, msg: Dict[str, str], *keys: str):
+        """Print a received message: header, message_type, any of keys present, sequence_number."""
+        lines = [self._incoming_header(), f"message_type: {message_type}"]
+        for key in keys + ("sequence_number",):
+            if key in msg:
+                lines.append(f"{key}: {msg[key]}")
+        log("\n".join(lines))
+
+    def _incoming_header(self) -> str:
+        addr = self.last_incoming_addr
+        header = self._headers.get(addr)
+        if header is None:
+            header = self._headers[addr] = self._format_incoming_header(addr)
+        return header
 
-    def _print_incoming_header(self):
+    def _format_incoming_header(self, addr: Optional[Tuple[str, int]]) -> str:
         label = self.remote_name or "REMOTE"
-        addr = self.last_incoming_addr
         if self.role == "HOST" and addr is not None:
             if self.peer_addr and addr == self.peer_addr:
                 label = self.remote_name or f"REMOTE {addr[0]}:{addr[1]}"
@@ -111,11 +288,15 @@ class ProtocolStateMachine:
                 if not spec:
                     spec = f"{addr[0]}:{addr[1]}"
                 label = f"SPECTATOR {spec}"
-        print(f"\n[{label}]")
+        return f"\n[{label}]"
 
     # ----------------------------
     # Tick called every loop
     # ----------------------------
+    def next_deadline(self) -> Optional[float]:
+        """When tick() next has timer work (see ReliabilityLayer.next_deadline)."""
+        return self.r.next_deadline()
+
     def tick(self):
         """
         Called from the main loop. Runs retransmission timers.
@@ -124,7 +305,7 @@ class ProtocolStateMachine:
         try:
             self.r.tick(self.transport)
         except ReliabilityError:
-            print("[StateMachine] Peer unresponsive. Ending battle.")
+            log("[StateMachine] Peer unresponsive. Ending battle.")
             self.running = False
             return
 
@@ -134,11 +315,12 @@ class ProtocolStateMachine:
 
         # If both sides should be processing the turn and we haven't sent our local
         # calculation report yet, attempt to send it.
-        if self.state == "PROCESSING_TURN" and self.local_calc_report is None:
+        # A peer that mirrors this turn's report has nothing to compute here.
+        if (self.state == "PROCESSING_TURN" and self.local_calc_report is None
+                and self._computes_damage()):
             # Determine which move to use: if we're the attacker, use last_announced_move;
             # otherwise use remote_move (defender sees remote_move).
-            move = None
-            if self.turn_owner == "LOCAL":
+            if self.turn_owner is Turn.LOCAL:
                 move = self.last_announced_move
             else:
                 move = self.remote_move
@@ -148,122 +330,127 @@ class ProtocolStateMachine:
                 try:
                     self.send_calculation_report(move)
                 except Exception as e:
-                    print(f"[StateMachine] Error sending calculation report: {e}")
+                    log(f"[StateMachine] Error sending calculation report: {e}")
 
     # ----------------------------
     # Incoming dispatcher
     # ----------------------------
+    _RECENT_DECODES_MAX = 256
+    _HANDLED_MAX = 256
+
+    def _decode(self, data: bytes) -> Dict[str, str]:
+        """decode_message, memoized over the most recent datagrams."""
+        recent = self._recent_decodes
+        msg = recent.get(data)
+        if msg is not None:
+            recent.move_to_end(data)
+            return msg
+        msg = decode_message(data)
+        recent[data] = msg
+        if len(recent) > self._RECENT_DECODES_MAX:
+            recent.popitem(last=False)
+        return msg
+
+    def _is_retransmit(self, addr: Tuple[str, int], seq: int, data: bytes) -> bool:
+        """
+        True if this exact datagram was already handled; otherwise record it.
+        Matching on the bytes as well as (addr, seq) keeps two different frames
+        that happen to share a sequence_number from being mistaken for one.
+        """
+        key = (addr, seq)
+        handled = self._handled
+        if handled.get(key) == data:
+            return True
+        handled[key] = data
+        if len(handled) > self._HANDLED_MAX:
+            handled.popitem(last=False)
+        return False
+
     def handle_incoming(self, incoming: Tuple[bytes, Tuple[str, int]]):
+        self.handle_incoming_batch((incoming,))
+
+    def handle_incoming_batch(self, frames: List[Tuple[bytes, Tuple[str, int]]]):
+        """
+        Handle several received (bytes, addr) frames in order, e.g. from
+        UDPTransport.receive_batch().
+        """
+        # Everything sent while handling the frames (ACKs, DEFENSE_ANNOUNCE,
+        # CALCULATION_REPORT, GAME_OVER, spectator relays) leaves in one flush.
+        transport = self.transport
+        batch = SendBatch(transport)
+        self.transport = batch
+        try:
+            for incoming in frames:
+                # One bad frame must not cost the rest of the batch, which
+                # may hold ACKs or the next step of the turn
+                try:
+                    self._handle_incoming(incoming)
+                except Exception as e:
+                    log(f"[SM] Error handling frame from {incoming[1]}: {e}")
+        finally:
+            self.transport = transport
+            batch.flush()
+
+    def _handle_incoming(self, incoming: Tuple[bytes, Tuple[str, int]]):
         data, addr = incoming
-        msg = decode_message(data)
+        msg = self._decode(data)
         message_type = msg.get("message_type")
         # Track incoming address for header context
         self.last_incoming_addr = addr
+        self.last_incoming_data = data
 
-        # Save peer address BEFORE processing reliability
-        if self.peer_addr is None and self.role != "SPECTATOR":
-            self.peer_addr = addr
-
-        self.r.incoming_message(msg, addr, self.transport)
-
-        # If HOST receives a battle/control event from JOINER, relay it to spectators
-        if self.role == "HOST" and self.peer_addr and addr == self.peer_addr:
-            # Relay everything except ACKs to spectators so they see the same stream
-            if message_type and message_type != "ACK":
-                try:
-                    # Forward original message bytes with the same sequence_number
-                    from .message import encode_message
-                    msg_bytes = encode_message(msg)
-                    seq = msg.get("sequence_number")
-                    if isinstance(seq, int):
-                        seq_int = seq
-                    else:
-                        try:
-                            seq_int = int(seq) if seq is not None else None
-                        except Exception:
-                            seq_int = None
-                    if seq_int is not None:
-                        self.r.track_and_send_existing(self.transport, msg_bytes, seq_int, list(self.spectators))
+        if self.role == "SPECTATOR":
+            # Spectators never adopt a peer address or relay anything, so skip
+            # straight to the ACK. The ACK itself must stay: the HOST tracks
+            # every frame it fans out to each spectator.
+            self.last_incoming_seq = seq = self.r.incoming_message(msg, addr, self.transport)
+            if seq is not None and self._is_retransmit(addr, seq, data):
+                return
+        else:
+            # Save peer address BEFORE processing reliability
+            if self.peer_addr is None:
+                self.peer_addr = addr
+                self._headers.clear()
+
+            self.last_incoming_seq = seq = self.r.incoming_message(msg, addr, self.transport)
+
+            # A retransmit has been ACKed again above; handling it again would
+            # repeat DEFENSE_ANNOUNCE, damage, relays and printing.
+            if seq is not None and self._is_retransmit(addr, seq, data):
+                return
+
+            # HOST relays, in one place for every message type:
+            # - anything but ACKs from the JOINER goes to all spectators
+            # - chat from a spectator goes to the JOINER
+            if self.role == "HOST" and message_type and message_type is not _MT_ACK:
+                if addr == self.peer_addr:
+                    dests = self.spectators
+                elif message_type is _MT_CHAT:
+                    dests = [self.peer_addr]
+                else:
+                    dests = None
+                if dests:
+                    # Forward the datagram as received: it already carries the
+                    # sender's sequence_number, so nothing needs re-encoding
+                    # and every destination gets the same buffer.
+                    if seq is not None:
+                        self.r.track_and_send_existing(self.transport, data, seq, dests)
                     else:
                         # If seq missing, just send (non-reliable)
-                        for spec_addr in list(self.spectators):
-                            try:
-                                self.transport.send(msg_bytes, spec_addr)
-                            except Exception:
-                                pass
-                except Exception:
-                    pass
+                        for dest in dests:
+                            self.transport.send(data, dest)
 
         # Dispatch by message type
-        if message_type == "HANDSHAKE_REQUEST":
-            self._on_handshake_request(msg, addr)
-
-        elif message_type == "HANDSHAKE_RESPONSE":
-            self._on_handshake_response(msg)
-
-        elif message_type == "SPECTATOR_REQUEST":
-            self._on_spectator_request(msg, addr)
-
-        elif message_type == "BATTLE_SETUP":
-            self._on_battle_setup(msg)
+        handler = self._dispatch.get(message_type)
+        if handler is not None:
+            handler(msg, addr)
 
-        elif message_type == "ATTACK_ANNOUNCE":
-            self._on_attack_announce(msg)
-
-        elif message_type == "DEFENSE_ANNOUNCE":
-            self._on_defense_announce(msg)
-
-        elif message_type == "CALCULATION_REPORT":
-            self._on_calculation_report(msg)
-
-        elif message_type == "CALCULATION_CONFIRM":
-            self._on_calculation_confirm(msg)
-
-        elif message_type == "RESOLUTION_REQUEST":
-            self._on_resolution_request(msg)
-
-        elif message_type == "GAME_OVER":
-            self._on_game_over(msg)
-
-        elif message_type == "CHAT_MESSAGE":
-            self._on_chat(msg)
-            # Relay chat across roles:
-            # - If HOST receives from spectator (addr != peer_addr), forward to JOINER
-            # - If HOST receives from JOINER (addr == peer_addr), forward to spectators
-            if self.role == "HOST":
-                try:
-                    from .message import encode_message
-                    msg_bytes = encode_message(msg)
-                    seq = msg.get("sequence_number")
-                    # Relay preserving original sequence_number
-                    if self.peer_addr and addr != self.peer_addr:
-                        # from spectator -> forward to joiner
-                        if seq is not None:
-                            try:
-                                self.r.track_and_send_existing(self.transport, msg_bytes, int(seq), [self.peer_addr])
-                            except Exception:
-                                # Fallback: non-reliable send
-                                self.transport.send(msg_bytes, self.peer_addr)
-                    else:
-                        # from joiner -> forward to all spectators
-                        dests = list(self.spectators)
-                        if seq is not None and dests:
-                            try:
-                                self.r.track_and_send_existing(self.transport, msg_bytes, int(seq), dests)
-                            except Exception:
-                                for spec_addr in dests:
-                                    self.transport.send(msg_bytes, spec_addr)
-                except Exception:
-                    pass
-
-        elif message_type == "ACK":
-            # Handle ACK for reliability layer
-            ack_num = msg.get("ack_number")
-            if ack_num is not None:
-                try:
-                    self.r.handle_ack(int(ack_num), addr)
-                except ValueError:
-                    pass
+    def _on_ack(self, msg, addr):
+        # Decoded fields are str; isdecimal() accepts exactly what int()
+        # does here, so malformed ACKs are dropped without raising.
+        ack_num = msg.get("ack_number")
+        if ack_num is not None and ack_num.isdecimal():
+            self.r.handle_ack(int(ack_num), addr)
 
     # ============================================================
     # ** HANDSHAKE **
@@ -285,19 +472,18 @@ class ProtocolStateMachine:
     
     def _on_handshake_request(self, msg, addr):
         """
-        Only HOST receives this.
+        Only HOST receives this (only the HOST's dispatch table routes it here).
         """
-        if self.role != "HOST":
-            return
-
-        import random
-        seed = random.randint(1, 999999)
+        # Draw the seed from the OS rather than the global random module, which
+        # game_logic.set_seed reseeds for battle rolls.
+        seed = int.from_bytes(os.urandom(4), "little")
 
         # HOST must also seed its RNG with the same seed
-        from . import game_logic
         game_logic.set_seed(seed)
 
         self.peer_addr = addr
+        self._headers.clear()
+        self._send_reliable = self._send_reliable_connected
         fields = {
             "message_type": "HANDSHAKE_RESPONSE",
             "seed": seed
@@ -307,69 +493,65 @@ class ProtocolStateMachine:
         
         # Transition to waiting for battle setup
         self.state = "WAITING_FOR_SETUP"
-        print(f"\n[{self.local_name}]")
-        print("message_type: HANDSHAKE_COMPLETE")
-        print("role: HOST")
-        print("state: WAITING_FOR_SETUP")
-        print(f"seed: {seed}")
+        log(f"\n[{self.local_name}]")
+        log("message_type: HANDSHAKE_COMPLETE")
+        log("role: HOST")
+        log("state: WAITING_FOR_SETUP")
+        log(f"seed: {seed}")
 
-    def _on_handshake_response(self, msg):
+    def _on_handshake_response(self, msg, addr):
         """
-        JOINER receives this.
+        JOINER receives this (only the JOINER's dispatch table routes it here).
         """
-        if self.role != "JOINER":
-            return
+        self._print_incoming("HANDSHAKE_RESPONSE", msg)
 
-        self._print_incoming_header()
-        print("message_type: HANDSHAKE_RESPONSE")
-        if "sequence_number" in msg:
-            print(f"sequence_number: {msg['sequence_number']}")
-
-        ok, missing = require_fields(msg, ["seed"])
+        ok, missing = _validate_handshake_response(msg)
         if not ok:
-            print(f"[SM] Missing field in handshake response: {missing}")
+            log(f"[SM] Missing field in handshake response: {missing}")
             return
 
         seed = int(msg["seed"])
         # Seed BOTH RNG instances in game logic
         # We assume game_logic.py has a set_seed() function
-        from . import game_logic
         game_logic.set_seed(seed)
 
+        # peer_addr was set before dispatch and is fixed from here on
+        self._send_reliable = self._send_reliable_connected
+
         # Transition to waiting for setup exchange
         self.state = "WAITING_FOR_SETUP"
-        print(f"\n[{self.local_name}]")
-        print("message_type: HANDSHAKE_COMPLETE")
-        print("role: JOINER")
-        print("state: WAITING_FOR_SETUP")
-        print(f"seed: {seed}")
+        log(f"\n[{self.local_name}]")
+        log("message_type: HANDSHAKE_COMPLETE")
+        log("role: JOINER")
+        log("state: WAITING_FOR_SETUP")
+        log(f"seed: {seed}")
 
     def _on_spectator_request(self, msg, addr):
         """
         Spectators just join and receive all battle/chat events.
         """
         # Record spectator address and optional name
-        if addr not in self.spectators:
+        if addr not in self._spectator_set:
+            self._spectator_set.add(addr)
             self.spectators.append(addr)
         provided = msg.get("sender_name") or msg.get("trainer_name")
         if isinstance(provided, str) and provided:
             self.spectator_names[addr] = provided
+            self._headers.clear()
         self.last_incoming_addr = addr
-        self._print_incoming_header()
-        print("message_type: SPECTATOR_JOINED")
-        print(f"address: {addr}")
+        lines = [self._incoming_header(), "message_type: SPECTATOR_JOINED", f"address: {addr}"]
         if "sequence_number" in msg:
-            print(f"sequence_number: {msg['sequence_number']}")
+            lines.append(f"sequence_number: {msg['sequence_number']}")
+        log("\n".join(lines))
 
         # Forward SPECTATOR_JOINED to JOINER with the same sequence_number so they see it too
         if self.role == "HOST" and self.peer_addr:
             try:
-                from .message import encode_message
-                msg_bytes = encode_message(msg)
-                seq = msg.get("sequence_number")
+                msg_bytes = self.last_incoming_data
+                seq = self.last_incoming_seq
                 if seq is not None:
                     try:
-                        self.r.track_and_send_existing(self.transport, msg_bytes, int(seq), [self.peer_addr])
+                        self.r.track_and_send_existing(self.transport, msg_bytes, seq, [self.peer_addr])
                     except Exception:
                         # Fallback: non-reliable send
                         self.transport.send(msg_bytes, self.peer_addr)
@@ -391,7 +573,7 @@ class ProtocolStateMachine:
             "communication_mode": "P2P",
             "pokemon_name": pokemon.name,
             "pokemon": pokemon.to_json(),
-            "stat_boosts": str(stat_boosts),
+            "stat_boosts": json.dumps(stat_boosts, separators=(",", ":")),
             "trainer_name": self.local_name,
         }
         ok, seq = self._send_reliable(fields)
@@ -402,55 +584,50 @@ class ProtocolStateMachine:
             self.state = "WAITING_FOR_MOVE"
             
             if self.role == "HOST":
-                self.turn_owner = "LOCAL"
+                self.turn_owner = Turn.LOCAL
             else:
-                self.turn_owner = "REMOTE"
+                self.turn_owner = Turn.REMOTE
 
-    def _on_battle_setup(self, msg):
+    def _on_battle_setup(self, msg, addr):
         # Cache remote trainer name if provided
         rn = msg.get("trainer_name")
-        if rn and rn != self.local_name:
+        if rn and rn != self.local_name and rn != self.remote_name:
             self.remote_name = rn
-        self._print_incoming_header()
-        print("message_type: BATTLE_SETUP")
-        if "sequence_number" in msg:
-            print(f"sequence_number: {msg['sequence_number']}")
+            self._headers.clear()
+        self._print_incoming("BATTLE_SETUP", msg)
 
-        ok, missing = require_fields(
-            msg,
-            ["pokemon", "pokemon_name"]
-        )
+        ok, missing = _validate_battle_setup(msg)
         if not ok:
-            print("[SM] Missing:", missing)
+            log("[SM] Missing:", missing)
             return
 
         # Load remote Pokémon
         try:
             self.remote_pokemon = BattlePokemon.from_json(msg["pokemon"])
         except Exception as e:
-            print(f"[SM] Error parsing remote pokemon: {e}")
+            log(f"[SM] Error parsing remote pokemon: {e}")
             return
 
-        print("[SM] Remote Pokémon:", self.remote_pokemon.name)
+        log("[SM] Remote Pokémon:", self.remote_pokemon.name)
 
         # If both Pokémon are ready, begin battle
         if self.local_pokemon and self.remote_pokemon:
-            print(f"\n[{self.local_name}]")
-            print("message_type: BATTLE_START")
-            print(f"local_pokemon: {self.local_pokemon.name}")
-            print(f"remote_pokemon: {self.remote_pokemon.name}")
+            log(f"\n[{self.local_name}]")
+            log("message_type: BATTLE_START")
+            log(f"local_pokemon: {self.local_pokemon.name}")
+            log(f"remote_pokemon: {self.remote_pokemon.name}")
             self.state = "WAITING_FOR_MOVE"
 
             if self.role == "HOST":
-                self.turn_owner = "LOCAL"
-                print(f"\n[{self.local_name}]")
-                print("message_type: TURN_ANNOUNCE")
-                print("turn_owner: LOCAL")
+                self.turn_owner = Turn.LOCAL
+                log(f"\n[{self.local_name}]")
+                log("message_type: TURN_ANNOUNCE")
+                log("turn_owner: LOCAL")
             else:
-                self.turn_owner = "REMOTE"
-                print(f"\n[{self.local_name}]")
-                print("message_type: TURN_ANNOUNCE")
-                print("turn_owner: REMOTE")
+                self.turn_owner = Turn.REMOTE
+                log(f"\n[{self.local_name}]")
+                log("message_type: TURN_ANNOUNCE")
+                log("turn_owner: REMOTE")
 
     # ============================================================
     # ** TURN 1: ATTACK ANNOUNCE **
@@ -460,7 +637,7 @@ class ProtocolStateMachine:
         """
         Called only when it is OUR turn.
         """
-        if self.turn_owner != "LOCAL":
+        if self.turn_owner is not Turn.LOCAL:
             return False
         if self.state != "WAITING_FOR_MOVE":
             return False
@@ -472,24 +649,17 @@ class ProtocolStateMachine:
             "message_type": "ATTACK_ANNOUNCE",
             "move_name": move_name
         }
-        ok, seq = self._send_reliable(fields)
-        self._print_message(fields, seq)
+        # Same newline scrubbing as encode_message
+        encoded = _ATTACK_ANNOUNCE_TEMPLATE % move_name.replace("\n", " ").encode("utf-8")
+        self._send_prefixed(fields, encoded)
 
         self.state = "WAITING_FOR_DEFENSE"
         return True
 
-    def _on_attack_announce(self, msg):
-        self._print_incoming_header()
-        print("message_type: ATTACK_ANNOUNCE")
-        if "move_name" in msg:
-            print(f"move_name: {msg['move_name']}")
-        if "sequence_number" in msg:
-            print(f"sequence_number: {msg['sequence_number']}")
-
-        if self.turn_owner != "REMOTE":
-            pass
+    def _on_attack_announce(self, msg, addr):
+        self._print_incoming("ATTACK_ANNOUNCE", msg, "move_name")
 
-        ok, missing = require_fields(msg, ["move_name"])
+        ok, missing = _validate_attack_announce(msg)
         if not ok:
             return
 
@@ -500,9 +670,7 @@ class ProtocolStateMachine:
             return
 
         # Immediately send defense announce and relay to spectators
-        fields = {"message_type": "DEFENSE_ANNOUNCE"}
-        ok, seq = self._send_reliable(fields)
-        self._print_message(fields, seq)
+        self._send_prefixed(_DEFENSE_ANNOUNCE, _DEFENSE_ANNOUNCE_BYTES)
 
         # Enter processing turn and trigger sending of calculation report on next tick
         self.state = "PROCESSING_TURN"
@@ -518,18 +686,16 @@ class ProtocolStateMachine:
     # ** TURN 2: DEFENSE ANNOUNCE **
     # ============================================================
 
-    def _on_defense_announce(self, msg):
-        self._print_incoming_header()
-        print("message_type: DEFENSE_ANNOUNCE")
-        if "sequence_number" in msg:
-            print(f"sequence_number: {msg['sequence_number']}")
-
-        if self.turn_owner != "LOCAL":
-            pass
+    def _on_defense_announce(self, msg, addr):
+        self._print_incoming("DEFENSE_ANNOUNCE", msg)
 
         # Spectators should not enter processing or calculate
         if self.role == "SPECTATOR":
             return
+        # A late or retransmitted DEFENSE_ANNOUNCE must not reopen a turn we
+        # have already closed
+        if self.state != "WAITING_FOR_DEFENSE":
+            return
 
         self.state = "PROCESSING_TURN"
 
@@ -544,6 +710,19 @@ class ProtocolStateMachine:
     # ** TURN 3: DAMAGE CALCULATION / REPORT **
     # ============================================================
 
+    def _computes_damage(self) -> bool:
+        """True if this peer runs calculate_damage itself on the current turn."""
+        return self.authoritative or self.turns_played % self.verify_every == 0
+
+    def _combatants(self) -> Tuple[BattlePokemon, BattlePokemon]:
+        """
+        (attacker, defender) for the current turn. If turn_owner is LOCAL then
+        the local peer issued the ATTACK_ANNOUNCE.
+        """
+        if self.turn_owner is Turn.LOCAL:
+            return self.local_pokemon, self.remote_pokemon
+        return self.remote_pokemon, self.local_pokemon
+
     def send_calculation_report(self, move_name: str):
         """
         Called once both sides reached PROCESSING_TURN.
@@ -551,40 +730,43 @@ class ProtocolStateMachine:
         This function determines whether the local peer is the attacker or the
         defender and calculates damage accordingly.
         """
+        # Non-authoritative peers wait for the authoritative report and mirror
+        # it (see _on_calculation_report), except on verification turns.
+        if not self._computes_damage():
+            return
+
         if not self.local_pokemon or not self.remote_pokemon:
             raise RuntimeError("Both local and remote Pokémon must be set before calculating damage")
 
         # Look up the move object from game_logic
-        from . import game_logic
         move = game_logic.get_move(move_name)
         if not move:
             raise RuntimeError(f"Move '{move_name}' not found in move database")
 
-        # Determine if local is the attacker or defender.
-        # If turn_owner == "LOCAL" then the local peer issued the ATTACK_ANNOUNCE.
-        local_is_attacker = (self.turn_owner == "LOCAL")
-
-        if local_is_attacker:
-            attacker = self.local_pokemon
-            defender = self.remote_pokemon
-            attacker_name = attacker.name
-            # compute damage dealt to remote
-            dmg = calculate_damage(attacker, defender, move)
-            defender.hp -= dmg
-            attacker_remaining = attacker.hp
-            defender_remaining = max(defender.hp, 0)
-        else:
-            # local is defender — remote attacked
-            attacker = self.remote_pokemon
-            defender = self.local_pokemon
-            attacker_name = attacker.name
-            dmg = calculate_damage(attacker, defender, move)
-            defender.hp -= dmg
-            # note: attacker_remaining is remote's HP (unchanged by this local calculation)
-            attacker_remaining = attacker.hp
-            defender_remaining = max(defender.hp, 0)
-
-        # Build status message with effectiveness wording
+        attacker, defender = self._combatants()
+        dmg = calculate_damage(attacker, defender, move)
+        defender_remaining = defender.apply_damage(dmg)
+
+        # calculate_damage and apply_damage already return ints
+        self._emit_calculation_report(attacker, defender, CalcReport(
+            attacker.name,
+            move_name,
+            attacker.hp,
+            dmg,
+            defender_remaining,
+            self._status_message(attacker, defender, move),
+        ))
+
+    def _status_message(self, attacker: BattlePokemon, defender: BattlePokemon, move: Move) -> str:
+        """
+        "<attacker> used <move>!" plus effectiveness wording. Types never change
+        mid-battle, so the text is cached per (attacker, move).
+        """
+        key = (attacker.name, move.name)
+        text = self._status_messages.get(key)
+        if text is not None:
+            return text
+
         effectiveness_msg = ""
         try:
             eff = game_logic.get_type_effectiveness(move.type, defender)
@@ -597,24 +779,70 @@ class ProtocolStateMachine:
         except Exception:
             pass
 
-        report = {
-            "message_type": "CALCULATION_REPORT",
-            "attacker": attacker_name,
-            "move_used": move_name,
-            "remaining_health": int(attacker_remaining),
-            "damage_dealt": int(dmg),
-            "defender_hp_remaining": int(defender_remaining),
-            "status_message": f"{attacker_name} used {move_name}!{effectiveness_msg}",
-        }
+        text = self._status_messages[key] = f"{attacker.name} used {move.name}!{effectiveness_msg}"
+        return text
+
+    def _is_current_report(self, remote: CalcReport) -> bool:
+        """
+        True if a CALCULATION_REPORT is for the turn we are processing: the
+        defender waits in PROCESSING_TURN, the attacker may still be waiting
+        for the DEFENSE_ANNOUNCE, and the report must name the attacker.
+        """
+        if not self.local_pokemon or not self.remote_pokemon:
+            return False
+        if self.state != "PROCESSING_TURN" and not (
+                self.state == "WAITING_FOR_DEFENSE" and self.turn_owner is Turn.LOCAL):
+            return False
+        attacker, _ = self._combatants()
+        return remote.attacker == attacker.name
 
-        self.local_calc_report = report
+    def _mirror_calculation_report(self, remote: CalcReport):
+        """
+        Non-authoritative peer: adopt the authoritative report instead of
+        recomputing damage. Boost uses are still consumed so both peers keep
+        the same counters for the next verification turn.
+
+        Echoing the report back would only make the other side compare it
+        with itself, so we confirm straight away and close our half of the
+        turn. The CONFIRM is what ends the turn on the other side. This means
+        that on non-verification turns only one report crosses the wire,
+        unlike the RFC's exchange of two.
+
+        The CONFIRM and _end_turn must run once per turn, so a report from
+        any other turn is ignored here.
+        """
+        if not self._is_current_report(remote):
+            return
+
+        if remote.defender_hp_remaining is None:
+            return
+        attacker, defender = self._combatants()
+        move = game_logic.get_move(remote.move_used)
+        if move:
+            game_logic.consume_stat_boosts(attacker, defender, move)
+        defender.hp = max(0, min(remote.defender_hp_remaining, defender.max_hp))
+
+        self._send_prefixed(_CALCULATION_CONFIRM, _CALCULATION_CONFIRM_BYTES)
+        self._send_game_over_if_fainted(attacker, defender)
+        self._end_turn()
+
+    def _emit_calculation_report(self, attacker: BattlePokemon, defender: BattlePokemon, local: CalcReport):
+        """Store and send our CALCULATION_REPORT, then GAME_OVER if the defender fainted."""
+        self.local_calc_report = local
+        report = {"message_type": "CALCULATION_REPORT", **local._asdict()}
 
         # Send the report reliably
         ok, seq = self._send_reliable(report)
         
         # Print outgoing message in RFC format with sequence_number
         self._print_message(report, seq)
+        self._send_game_over_if_fainted(attacker, defender)
 
+        # The peer's report may have arrived before we computed ours
+        if self.last_calc_report_remote is not None:
+            self._answer_calculation_report(local, self.last_calc_report_remote)
+
+    def _send_game_over_if_fainted(self, attacker: BattlePokemon, defender: BattlePokemon):
         # If this damage caused a faint locally, send GAME_OVER to peer
         if defender.hp <= 0:
             loser = defender.name
@@ -627,89 +855,89 @@ class ProtocolStateMachine:
             ok, seq = self._send_reliable(fields)
             self._print_message(fields, seq)
 
-    def _on_calculation_report(self, msg):
-        self._print_incoming_header()
-        print("message_type: CALCULATION_REPORT")
-        if "attacker" in msg:
-            print(f"attacker: {msg['attacker']}")
-        if "move_used" in msg:
-            print(f"move_used: {msg['move_used']}")
-        if "damage_dealt" in msg:
-            print(f"damage_dealt: {msg['damage_dealt']}")
-        if "defender_hp_remaining" in msg:
-            print(f"defender_hp_remaining: {msg['defender_hp_remaining']}")
-        if "sequence_number" in msg:
-            print(f"sequence_number: {msg['sequence_number']}")
+    def _on_calculation_report(self, msg, addr):
+        self._print_incoming("CALCULATION_REPORT", msg, "attacker", "move_used", "damage_dealt", "defender_hp_remaining")
 
-        ok, missing = require_fields(
-            msg, 
-            ["attacker", "move_used", "damage_dealt", "defender_hp_remaining"]
-        )
+        ok, missing = _validate_calculation_report(msg)
         if not ok:
             return
 
-        self.last_calc_report_remote = msg
-
-        # If we have not calculated our local version yet, wait.
-        if self.local_calc_report is None:
+        try:
+            remote = parse_calc_report(msg)
+        except MessageParseError:
             return
+        # Drop reports that do not belong to the turn in progress, e.g. a
+        # retransmission from the previous turn arriving late. The one
+        # exception is a report the peer is still waiting on us to answer.
+        if self.role != "SPECTATOR" and not self._is_current_report(remote):
+            late = self._late_report_local
+            if late is not None and remote.attacker == late.attacker and remote.move_used == late.move_used:
+                self._late_report_local = None
+                self._answer_calculation_report(late, remote)
+            return
+        self.last_calc_report_remote = remote
 
-        # Compare for discrepancy
+        # If we have not calculated our local version yet, wait; it is
+        # answered once ours is sent. The non-authoritative peer instead
+        # adopts this report and confirms it.
         local = self.local_calc_report
-        remote = msg
-
-        try:
-            local_dmg = int(local["damage_dealt"])
-            remote_dmg = int(remote["damage_dealt"])
-            local_def_hp = int(local["defender_hp_remaining"])
-            remote_def_hp = int(remote["defender_hp_remaining"])
-        except Exception:
+        if local is None:
+            if self.role != "SPECTATOR" and not self._computes_damage():
+                self._mirror_calculation_report(remote)
             return
+        self._answer_calculation_report(local, remote)
 
-        if (local_dmg == remote_dmg and local_def_hp == remote_def_hp):
+    def _answer_calculation_report(self, local: CalcReport, remote: CalcReport):
+        """CONFIRM the peer's report if it matches ours, else request resolution."""
+        # Compare for discrepancy
+        if (local.damage_dealt == remote.damage_dealt
+                and local.defender_hp_remaining == remote.defender_hp_remaining):
             # Synchronized
-            fields = {"message_type": "CALCULATION_CONFIRM"}
-            ok, seq = self._send_reliable(fields)
-            self._print_message(fields, seq)
+            self._send_prefixed(_CALCULATION_CONFIRM, _CALCULATION_CONFIRM_BYTES)
         else:
             # Send our calculated values for resolution
             fields = {
                 "message_type": "RESOLUTION_REQUEST",
-                "attacker": local.get("attacker"),
-                "move_used": local.get("move_used"),
-                "damage_dealt": str(local.get("damage_dealt")),
-                "defender_hp_remaining": str(local.get("defender_hp_remaining"))
+                "attacker": local.attacker,
+                "move_used": local.move_used,
+                "damage_dealt": str(local.damage_dealt),
+                "defender_hp_remaining": str(local.defender_hp_remaining)
             }
             ok, seq = self._send_reliable(fields)
             self._print_message(fields, seq)
 
+        if self._peer_confirmed:
+            self._end_turn()
+
     # ============================================================
     # ** TURN 4: CONFIRMATION / RESOLUTION **
     # ============================================================
 
-    def _on_calculation_confirm(self, msg):
-        self._print_incoming_header()
-        print("message_type: CALCULATION_CONFIRM")
-        if "sequence_number" in msg:
-            print(f"sequence_number: {msg['sequence_number']}")
+    def _on_calculation_confirm(self, msg, addr):
+        self._print_incoming("CALCULATION_CONFIRM", msg)
 
-        # Turn ends — reverse turn ownership
-        self.turn_owner = "REMOTE" if self.turn_owner == "LOCAL" else "LOCAL"
+        # The authoritative peer reports every turn. If its CONFIRM overtook
+        # that report, we still owe it an answer, so the turn ends once the
+        # report arrives.
+        if (self.role != "SPECTATOR" and not self.authoritative
+                and self.last_calc_report_remote is None):
+            self._peer_confirmed = True
+            return
 
-        self.local_calc_report = None
-        self.last_calc_report_remote = None
-        self.state = "WAITING_FOR_MOVE"
+        # On a verification turn the peer's own report may still be in flight
+        late = self.local_calc_report if self.last_calc_report_remote is None else None
 
-    def _on_resolution_request(self, msg):
-        self._print_incoming_header()
-        print("message_type: RESOLUTION_REQUEST")
-        if "sequence_number" in msg:
-            print(f"sequence_number: {msg['sequence_number']}")
+        # Turn ends — reverse turn ownership
+        self._end_turn()
+        self._late_report_local = late
+
+    def _on_resolution_request(self, msg, addr):
+        self._print_incoming("RESOLUTION_REQUEST", msg)
 
         # Accept peer's corrected calculation
         try:
             dmg = int(msg["damage_dealt"])
-            hp = int(msg["defender_hp_remaining"])
+            hp = max(0, int(msg["defender_hp_remaining"]))
         except Exception:
             return
 
@@ -717,74 +945,91 @@ class ProtocolStateMachine:
         # We must determine which Pokémon was defender in that report.
         defender_name = None
         if "attacker" in msg:
-            attacker_name = msg["attacker"]
-            # If attacker matches our remote, then defender is local; otherwise defender is remote
-            if self.remote_pokemon and attacker_name == self.remote_pokemon.name:
-                # remote attacked local
-                if self.local_pokemon:
-                    self.local_pokemon.hp = hp
-                    defender_name = self.local_pokemon.name
+            # The turn owner already says who attacked, and also copes with both
+            # sides fielding the same species. Spectators never own a turn, so
+            # they fall back to matching the attacker's name.
+            if self.turn_owner is not None:
+                remote_attacked = self.turn_owner is Turn.REMOTE
             else:
-                if self.remote_pokemon:
-                    self.remote_pokemon.hp = hp
-                    defender_name = self.remote_pokemon.name
+                remote_attacked = bool(self.remote_pokemon) and msg["attacker"] == self.remote_pokemon.name
+            # If remote attacked, local defended
+            defender = (self.remote_pokemon, self.local_pokemon)[remote_attacked]
+            if defender:
+                defender.hp = hp
+                defender_name = defender.name
 
         # Turn ends normally
-        self.turn_owner = "REMOTE" if self.turn_owner == "LOCAL" else "LOCAL"
-        self.state = "WAITING_FOR_MOVE"
+        self._end_turn()
 
-        print(f"[SM] Resolution applied to {defender_name}, hp set to {hp}")
+        log(f"[SM] Resolution applied to {defender_name}, hp set to {hp}")
+
+    def _end_turn(self):
+        """
+        Hand the turn to the other side and reset per-turn calculation state.
+        Spectators never own a turn, so their turn_owner stays None.
+        """
+        if self.turn_owner is not None:
+            self.turn_owner = _TURN_FLIP[self.turn_owner]
+        self.turns_played += 1
+        self.local_calc_report = None
+        self.last_calc_report_remote = None
+        self._peer_confirmed = False
+        self.state = "WAITING_FOR_MOVE"
 
     # ============================================================
     # ** GAME OVER **
     # ============================================================
 
-    def _on_game_over(self, msg):
-        self._print_incoming_header()
-        print("message_type: GAME_OVER")
-        if "winner" in msg:
-            print(f"winner: {msg['winner']}")
-        if "loser" in msg:
-            print(f"loser: {msg['loser']}")
+    def _on_game_over(self, msg, addr):
+        winner, loser = msg.get("winner"), msg.get("loser")
+        lines = [self._incoming_header(), "message_type: GAME_OVER"]
+        if winner is not None:
+            lines.append(f"winner: {winner}")
+        if loser is not None:
+            lines.append(f"loser: {loser}")
         if "sequence_number" in msg:
-            print(f"sequence_number: {msg['sequence_number']}")
-        
-        print("\nWinner:", msg.get("winner"))
-        print("\nLoser:", msg.get("loser"))
+            lines.append(f"sequence_number: {msg['sequence_number']}")
+        lines.append(f"\nWinner: {winner}")
+        lines.append(f"\nLoser: {loser}")
+        log("\n".join(lines))
         self.running = False
 
     # ============================================================
     # ** CHAT MESSAGES **
     # ============================================================
 
-    def _on_chat(self, msg):
+    def _on_chat(self, msg, addr):
+        sender, content_type, text, sticker_data, seq = map(msg.get, _CHAT_FIELDS)
+
         # Update name caches from chat
-        sender = msg.get("sender_name")
         if sender and sender != self.local_name:
             addr = self.last_incoming_addr
             if self.role == "HOST" and addr is not None and (self.peer_addr is None or addr != self.peer_addr):
-                self.spectator_names[addr] = sender
+                if self.spectator_names.get(addr) != sender:
+                    self.spectator_names[addr] = sender
+                    self._headers.clear()
             else:
                 if not self.remote_name:
                     self.remote_name = sender
-        self._print_incoming_header()
-        print("message_type: CHAT_MESSAGE")
-        if "sender_name" in msg:
-            print(f"sender_name: {msg['sender_name']}")
-        if "content_type" in msg:
-            print(f"content_type: {msg['content_type']}")
-        if msg.get("content_type") == "TEXT":
-            if "message_text" in msg:
-                print(f"message_text: {msg.get('message_text')}")
-        elif msg.get("content_type") == "STICKER":
-            sticker_data = msg.get("sticker_data")
+                    self._headers.clear()
+        lines = [self._incoming_header(), "message_type: CHAT_MESSAGE"]
+        if sender is not None:
+            lines.append(f"sender_name: {sender}")
+        if content_type is not None:
+            lines.append(f"content_type: {content_type}")
+        if content_type is _CT_TEXT:
+            if text is not None:
+                lines.append(f"message_text: {text}")
+        elif content_type is _CT_STICKER:
             if sticker_data:
-                filename = chat.save_sticker_to_file(sticker_data)
-                print(f"sticker_data: [Base64 encoded, saved to {filename}]")
+                lines.append(f"sticker_data: [Base64 encoded, {len(sticker_data)} chars]")
+                _sticker_writer.submit(chat.save_sticker_to_file, sticker_data).add_done_callback(_log_sticker_saved)
             else:
-                print("sticker_data: [No data]")
-        if "sequence_number" in msg:
-            print(f"sequence_number: {msg['sequence_number']}")
+                lines.append("sticker_data: [No data]")
+        if seq is not None:
+            lines.append(f"sequence_number: {seq}")
+        log("\n".join(lines))
+        # HOST-side chat relays happen in _handle_incoming with every other relay.
 
     def send_chat_text(self, sender_name: str, text: str):
         """
@@ -794,17 +1039,17 @@ class ProtocolStateMachine:
             sender_name: Name of the sender
             text: Message text content
         """
+        # Goes to the peer and, on the HOST, straight to every spectator with
+        # the same sequence_number; nothing relays our own chat afterwards.
         msg_dict = chat.make_text_message(sender_name, text)
         ok, seq = self._send_reliable(msg_dict)
         
         # Print outgoing message in RFC format
-        print(f"\n[{self.local_name}]")
-        print("message_type: CHAT_MESSAGE")
-        print(f"sender_name: {sender_name}")
-        print("content_type: TEXT")
-        print(f"message_text: {text}")
+        lines = [f"\n[{self.local_name}]", "message_type: CHAT_MESSAGE",
+                 f"sender_name: {sender_name}", "content_type: TEXT", f"message_text: {text}"]
         if seq is not None:
-            print(f"sequence_number: {seq}")
+            lines.append(f"sequence_number: {seq}")
+        log("\n".join(lines))
 
     def send_chat_sticker(self, sender_name: str, sticker_bytes: bytes):
         """
@@ -814,14 +1059,28 @@ class ProtocolStateMachine:
             sender_name: Name of the sender
             sticker_bytes: Raw binary sticker data (e.g., PNG file bytes)
         """
-        msg_dict = chat.make_sticker_message(sender_name, sticker_bytes)
-        ok, seq = self._send_reliable(msg_dict)
+        if not self.peer_addr:
+            return
+        # Encode the frame straight to bytes and hand it to the reliability
+        # layer as-is, so the Base64 payload is never copied through str.
+        # Retransmits reuse these bytes from the pending table.
+        sticker_data = chat.encode_sticker(sticker_bytes)
+        seq = self.r.next_sequence_number()
+        header = {
+            "message_type": "CHAT_MESSAGE",
+            "sender_name": sender_name,
+            "content_type": "STICKER",
+            "sequence_number": seq,
+        }
+        msg_bytes = encode_message_with_blob(header, "sticker_data", sticker_data)
+        self.r.track_and_send_existing(self.transport, msg_bytes, seq, self._destinations())
         
         # Print outgoing message in RFC format
-        print(f"\n[{self.local_name}]")
-        print("message_type: CHAT_MESSAGE")
-        print(f"sender_name: {sender_name}")
-        print("content_type: STICKER")
-        print(f"sticker_data: [Base64 encoded, {len(sticker_bytes)} bytes]")
-        if seq is not None:
-            print(f"sequence_number: {seq}")
+        log("\n".join((
+            f"\n[{self.local_name}]",
+            "message_type: CHAT_MESSAGE",
+            f"sender_name: {sender_name}",
+            "content_type: STICKER",
+            f"sticker_data: [Base64 encoded, {len(sticker_bytes)} bytes]",
+            f"sequence_number: {seq}",
+        )))
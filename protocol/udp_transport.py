@@ -1,5 +1,9 @@
+import select
 import socket
-from typing import Optional, Tuple
+import threading
+from typing import List, Optional, Tuple
+
+from .console import log
 
 class UDPTransport:
     def __init__(self, port: int, host: str):
@@ -7,6 +11,8 @@ class UDPTransport:
         self.host = host
         self.socket = None
         self.running = False
+        # Resolved address the socket is connected to, if any (see connect())
+        self.peer: Optional[Tuple[str, int]] = None
 
     def open(self):
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -19,17 +25,48 @@ class UDPTransport:
         self.socket.settimeout(0.01)
         
         self.running = True
-        print("\nmessage_type: UDP_BIND")
-        print(f"host: {self.host}")
-        print(f"port: {self.port}")
+        log("\nmessage_type: UDP_BIND")
+        log(f"host: {self.host}")
+        log(f"port: {self.port}")
+
+    def connect(self, addr: Tuple[str, int]) -> Tuple[str, int]:
+        """
+        Connect the socket to addr so the kernel resolves and validates the
+        destination once; sends to it then use send() rather than sendto().
+        Only for roles that talk to a single peer (JOINER, SPECTATOR): a
+        connected socket drops datagrams from any other address.
+        Returns the resolved (host, port).
+        """
+        self.socket.connect(addr)
+        self.peer = self.socket.getpeername()
+        return self.peer
 
     def send(self, data: bytes, addr: Tuple[str, int]):
         try:
-            self.socket.sendto(data, addr)
+            if addr == self.peer:
+                self.socket.send(data)
+            else:
+                self.socket.sendto(data, addr)
             return True
         except Exception as e:
-            print(f"[UDP] Send error: {e}")
+            log(f"[UDP] Send error: {e}")
             return False
+
+    def send_many(self, frames: List[Tuple[bytes, Tuple[str, int]]]):
+        """Send a batch of (data, addr) datagrams back to back."""
+        sock = self.socket
+        peer = self.peer
+        ok = True
+        for data, addr in frames:
+            try:
+                if addr == peer:
+                    sock.send(data)
+                else:
+                    sock.sendto(data, addr)
+            except Exception as e:
+                log(f"[UDP] Send error: {e}")
+                ok = False
+        return ok
     
     def receive(self) -> Optional[Tuple[bytes, Tuple[str, int]]]:
         try:
@@ -37,12 +74,92 @@ class UDPTransport:
             return data, addr
         except socket.timeout:
             return None
+        except ConnectionRefusedError:
+            # ICMP port unreachable, reported on connected sockets when the
+            # peer is not up yet; retransmission covers it.
+            return None
         except Exception as e:
-            print(f"[UDP] Receive error: {e}")
+            log(f"[UDP] Receive error: {e}")
             return None
+
+    def receive_batch(self, max_count: int = 32, timeout: Optional[float] = None) -> List[Tuple[bytes, Tuple[str, int]]]:
+        """
+        Wait for one datagram as receive() does, then drain up to max_count-1
+        more that are already queued, without waiting for them. Returns an
+        empty list on timeout.
+
+        timeout (seconds, > 0) replaces the socket's receive timeout from
+        this call on; None keeps the current one.
+        """
+        sock = self.socket
+        if timeout is not None and timeout != sock.gettimeout():
+            sock.settimeout(timeout)
+        first = self.receive()
+        if first is None:
+            return []
+        frames = [first]
+        # Poll readiness with a zero wait rather than switching the socket to
+        # non-blocking: the input thread may be sending on it at the same time.
+        try:
+            while len(frames) < max_count and select.select((sock,), (), (), 0)[0]:
+                frames.append(sock.recvfrom(65535))
+        except ConnectionRefusedError:
+            pass
+        except Exception as e:
+            log(f"[UDP] Receive error: {e}")
+        return frames
         
     def close(self):
         self.running = False
         if self.socket:
             self.socket.close()
-            print(f"[UDP] Socket on {self.host}:{self.port} closed")
+            log(f"[UDP] Socket on {self.host}:{self.port} closed")
+
+
+def send_frames(transport, frames: List[Tuple[bytes, Tuple[str, int]]]) -> bool:
+    """
+    Hand a list of (data, addr) frames to transport in one send_many() call,
+    or one send() per frame if it has no send_many (e.g. test doubles).
+    """
+    if len(frames) > 1:
+        send_many = getattr(transport, "send_many", None)
+        if send_many is not None:
+            return send_many(frames)
+    ok = True
+    send = transport.send
+    for data, addr in frames:
+        if not send(data, addr):
+            ok = False
+    return ok
+
+
+class SendBatch:
+    """
+    Stands in for a transport while one incoming frame is handled, queuing
+    every outgoing datagram (ACKs, replies, relays) and handing them to the
+    real transport in a single flush(). Sends from any other thread (e.g. the
+    UI sending chat) bypass the queue.
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.owner = threading.get_ident()
+        self.frames: List[Tuple[bytes, Tuple[str, int]]] = []
+
+    def send(self, data: bytes, addr: Tuple[str, int]):
+        if threading.get_ident() != self.owner:
+            return self.transport.send(data, addr)
+        self.frames.append((data, addr))
+        return True
+
+    def send_many(self, frames: List[Tuple[bytes, Tuple[str, int]]]):
+        if threading.get_ident() != self.owner:
+            return send_frames(self.transport, frames)
+        self.frames.extend(frames)
+        return True
+
+    def flush(self):
+        frames, self.frames = self.frames, []
+        if not frames:
+            return True
+        return send_frames(self.transport, frames)